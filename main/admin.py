@@ -1,13 +1,26 @@
-from django.contrib import admin
+import codecs
+
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.core.exceptions import PermissionDenied
+from django.http import StreamingHttpResponse
+from django.shortcuts import redirect, render
 from django.utils.html import format_html
-from django.urls import reverse
+from django.urls import path, reverse
 from django.utils.safestring import mark_safe
 from django.db import models
 from django.forms import Textarea
+from django.utils import timezone
 from .models import (
     CompanyProfile, CompanyStats, ServiceCategory, Service, TeamMember,
-    Partner, NewsArticle, Project, ContactInquiry, Newsletter, Testimonial, SEOSettings
+    Partner, NewsArticle, Project, ContactInquiry, Newsletter, Testimonial, SEOSettings, Job,
+    Campaign, CampaignDelivery
 )
+from .invalidation import invalidate_model
+from .search import reindex_queryset
+from .renditions import thumbnail_url
+from .newsletter import export_csv, import_subscribers
+from .exports import export_response
 
 # Custom Admin Site Configuration
 admin.site.site_header = "NUPO Consult Admin Dashboard"
@@ -29,6 +42,48 @@ class BaseModelAdmin(admin.ModelAdmin):
             list_display.append('created_at')
         return list_display
 
+    def response_action(self, request, queryset):
+        # Bulk actions use queryset.update(), which sends no save signals
+        response = super().response_action(request, queryset)
+        action = self.get_actions(request).get(request.POST.get('action'))
+        if action is not None and getattr(action[0], 'read_only', False):
+            return response
+        if not request.POST.get('select_across'):
+            queryset = queryset.filter(pk__in=request.POST.getlist(helpers.ACTION_CHECKBOX_NAME))
+        reindex_queryset(queryset)
+        invalidate_model(self.model, *queryset.values_list('pk', flat=True))
+        return response
+
+def export_action(format, label):
+    """Admin action streaming the selected rows (see main/exports.py)"""
+    def action(modeladmin, request, queryset):
+        return export_response(modeladmin.model, queryset, format)
+    action.__name__ = f'export_{format}'
+    action.short_description = f"Export selected as {label}"
+    action.read_only = True
+    return action
+
+EXPORT_ACTIONS = [
+    export_action('csv', 'CSV'),
+    export_action('excel', 'Excel CSV'),
+    export_action('jsonl', 'JSON Lines'),
+]
+
+def image_preview(fieldfile, width=50, height=50, style='object-fit: cover;', empty="No Image"):
+    """Lazy-loaded stored thumbnail; a grey box until process_jobs has made it"""
+    if not fieldfile:
+        return empty
+    url = thumbnail_url(fieldfile)
+    if url is None:
+        return format_html(
+            '<span title="Thumbnail pending" style="display: inline-block; width: {}px; height: {}px; background: #e9ecef; {}"></span>',
+            width, height, style
+        )
+    return format_html(
+        '<img src="{}" width="{}" height="{}" loading="lazy" decoding="async" alt="" style="{}" />',
+        url, width, height, style
+    )
+
 @admin.register(CompanyProfile)
 class CompanyProfileAdmin(BaseModelAdmin):
     list_display = ['name', 'tagline', 'email', 'phone', 'created_at']
@@ -209,9 +264,7 @@ class TeamMemberAdmin(BaseModelAdmin):
     }
     
     def profile_image_preview(self, obj):
-        if obj.profile_image:
-            return format_html('<img src="{}" width="50" height="50" style="border-radius: 50%; object-fit: cover;" />', obj.profile_image.url)
-        return "No Image"
+        return image_preview(obj.profile_image, style='border-radius: 50%; object-fit: cover;')
     profile_image_preview.short_description = 'Profile Image'
     
     actions = ['make_featured', 'remove_featured']
@@ -252,14 +305,12 @@ class PartnerAdmin(BaseModelAdmin):
     )
     
     def logo_preview(self, obj):
-        if obj.logo:
-            return format_html('<img src="{}" width="50" height="30" style="object-fit: contain;" />', obj.logo.url)
-        return "No Logo"
+        return image_preview(obj.logo, height=30, style='object-fit: contain;', empty="No Logo")
     logo_preview.short_description = 'Logo'
 
 @admin.register(NewsArticle)
 class NewsArticleAdmin(BaseModelAdmin):
-    list_display = ['title', 'article_type', 'author', 'is_featured', 'is_published', 'published_date', 'views_count']
+    list_display = ['title', 'article_type', 'author', 'is_featured', 'is_published', 'published_date', 'views_count', 'featured_image_preview']
     list_filter = ['article_type', 'is_featured', 'is_published', 'published_date', 'author']
     search_fields = ['title', 'excerpt', 'content']
     prepopulated_fields = {'slug': ('title',)}
@@ -291,6 +342,10 @@ class NewsArticleAdmin(BaseModelAdmin):
         })
     )
     
+    def featured_image_preview(self, obj):
+        return image_preview(obj.featured_image, width=80, height=45)
+    featured_image_preview.short_description = 'Image'
+    
     actions = ['publish', 'unpublish', 'make_featured']
     
     def publish(self, request, queryset):
@@ -322,7 +377,7 @@ class ProjectTeamInline(admin.TabularInline):
 
 @admin.register(Project)
 class ProjectAdmin(BaseModelAdmin):
-    list_display = ['name', 'client', 'project_type', 'status', 'start_date', 'end_date', 'is_featured', 'is_public']
+    list_display = ['name', 'client', 'project_type', 'status', 'start_date', 'end_date', 'is_featured', 'is_public', 'featured_image_preview']
     list_filter = ['project_type', 'status', 'is_featured', 'is_public', 'start_date']
     search_fields = ['name', 'client', 'description', 'location']
     prepopulated_fields = {'slug': ('name',)}
@@ -355,7 +410,11 @@ class ProjectAdmin(BaseModelAdmin):
         models.JSONField: {'widget': Textarea(attrs={'rows': 3, 'cols': 80})},
     }
     
-    actions = ['make_featured', 'make_public', 'make_private']
+    def featured_image_preview(self, obj):
+        return image_preview(obj.featured_image, width=80, height=45)
+    featured_image_preview.short_description = 'Image'
+    
+    actions = ['make_featured', 'make_public', 'make_private', *EXPORT_ACTIONS]
     
     def make_featured(self, request, queryset):
         queryset.update(is_featured=True)
@@ -404,7 +463,7 @@ class ContactInquiryAdmin(BaseModelAdmin):
     
     filter_horizontal = ['services_interested']
     
-    actions = ['mark_responded', 'mark_unresponded', 'set_high_priority']
+    actions = ['mark_responded', 'mark_unresponded', 'set_high_priority', *EXPORT_ACTIONS]
     
     def mark_responded(self, request, queryset):
         from django.utils import timezone
@@ -451,6 +510,46 @@ class NewsletterAdmin(BaseModelAdmin):
     }
     
     actions = ['activate_subscriptions', 'deactivate_subscriptions']
+    change_list_template = 'admin/main/newsletter/change_list.html'
+    
+    def get_urls(self):
+        urls = [
+            path('import/', self.admin_site.admin_view(self.import_view), name='main_newsletter_import'),
+            path('export/', self.admin_site.admin_view(self.export_view), name='main_newsletter_export'),
+        ]
+        return urls + super().get_urls()
+    
+    def import_view(self, request):
+        """Upsert subscribers from an uploaded CSV, read line by line"""
+        if not self.has_add_permission(request) or not self.has_change_permission(request):
+            raise PermissionDenied
+        if request.method == 'POST' and request.FILES.get('csv_file'):
+            lines = codecs.iterdecode(request.FILES['csv_file'], 'utf-8-sig')
+            try:
+                counts = import_subscribers(lines)
+            except (ValueError, UnicodeDecodeError) as e:
+                self.message_user(request, f"Import failed: {e}", messages.ERROR)
+            else:
+                self.message_user(
+                    request,
+                    f"{counts['upserted']} subscribers imported; "
+                    f"{counts['duplicates']} duplicate and {counts['invalid']} invalid rows skipped."
+                )
+                return redirect('admin:main_newsletter_changelist')
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Import subscribers',
+        }
+        return render(request, 'admin/main/newsletter/import.html', context)
+    
+    def export_view(self, request):
+        """Stream the active subscribers as CSV"""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        response = StreamingHttpResponse(export_csv(), content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = 'attachment; filename="newsletter-subscribers.csv"'
+        return response
     
     def activate_subscriptions(self, request, queryset):
         queryset.update(is_active=True, unsubscribed_date=None)
@@ -465,7 +564,7 @@ class NewsletterAdmin(BaseModelAdmin):
 
 @admin.register(Testimonial)
 class TestimonialAdmin(BaseModelAdmin):
-    list_display = ['client_name', 'client_company', 'rating', 'is_featured', 'is_approved', 'project', 'service']
+    list_display = ['client_name', 'client_company', 'rating', 'is_featured', 'is_approved', 'project', 'service', 'client_photo_preview']
     list_filter = ['rating', 'is_featured', 'is_approved', 'created_at']
     search_fields = ['client_name', 'client_company', 'content']
     list_editable = ['is_featured', 'is_approved']
@@ -487,6 +586,10 @@ class TestimonialAdmin(BaseModelAdmin):
         })
     )
     
+    def client_photo_preview(self, obj):
+        return image_preview(obj.client_photo, style='border-radius: 50%; object-fit: cover;')
+    client_photo_preview.short_description = 'Photo'
+    
     actions = ['approve', 'unapprove', 'make_featured']
     
     def approve(self, request, queryset):
@@ -530,6 +633,77 @@ class SEOSettingsAdmin(BaseModelAdmin):
         })
     )
 
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'key', 'status', 'attempts', 'available_at', 'updated_at']
+    list_filter = ['status', 'kind']
+    search_fields = ['key', 'last_error']
+    readonly_fields = [
+        'key', 'kind', 'payload', 'status', 'attempts', 'max_attempts',
+        'available_at', 'locked_until', 'last_error', 'created_at', 'updated_at'
+    ]
+    actions = ['retry_jobs']
+
+    def has_add_permission(self, request):
+        # Jobs are queued by the application, not by hand
+        return False
+
+    def retry_jobs(self, request, queryset):
+        updated = queryset.exclude(status='running').update(
+            status='pending', attempts=0, available_at=timezone.now(), locked_until=None
+        )
+        self.message_user(request, f"{updated} jobs queued for retry.")
+    retry_jobs.short_description = "Retry selected jobs"
+
+@admin.register(Campaign)
+class CampaignAdmin(BaseModelAdmin):
+    list_display = ['name', 'subject', 'status', 'delivery_progress', 'started_at', 'sent_at']
+    list_filter = ['status']
+    search_fields = ['name', 'subject']
+    readonly_fields = ['status', 'started_at', 'sent_at']
+    
+    fieldsets = (
+        ('Message', {
+            'fields': ('name', 'subject', 'body_text', 'body_html')
+        }),
+        ('Audience', {
+            'fields': ('audience', 'segment_key')
+        }),
+        ('Delivery', {
+            'fields': ('status', 'started_at', 'sent_at'),
+            'description': 'Send with: python manage.py send_campaign &lt;id&gt;'
+        }),
+        ('Timestamps', {
+            'fields': ('created_at', 'updated_at'),
+            'classes': ('collapse',)
+        })
+    )
+    
+    formfield_overrides = {
+        models.JSONField: {'widget': Textarea(attrs={'rows': 3, 'cols': 80})},
+    }
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            delivered=models.Count('deliveries', filter=models.Q(deliveries__status='sent')),
+            recipients=models.Count('deliveries'),
+        )
+    
+    def delivery_progress(self, obj):
+        return f"{obj.delivered} / {obj.recipients}"
+    delivery_progress.short_description = 'Sent'
+
+@admin.register(CampaignDelivery)
+class CampaignDeliveryAdmin(admin.ModelAdmin):
+    list_display = ['email', 'campaign', 'segment', 'status', 'sent_at']
+    list_filter = ['status', 'campaign']
+    search_fields = ['email']
+    list_select_related = ['campaign']
+    readonly_fields = ['campaign', 'subscriber', 'email', 'segment', 'status', 'error', 'sent_at']
+    
+    def has_add_permission(self, request):
+        return False
+
 # Custom Admin Dashboard
 class AdminDashboard:
     """Custom admin dashboard with statistics"""
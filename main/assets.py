@@ -0,0 +1,166 @@
+"""
+Static asset bundles.
+
+Third-party CSS/JS is committed under ``main/static/vendor/`` (see VENDOR;
+``manage.py vendor_assets`` checks it against the pinned digests) and
+the site's own CSS lives in ``main/static/main/css/``. BUNDLES groups them
+into one stylesheet/script per page type. The AOS scroll animations the CDN
+pages used are not among them; templates carry no ``data-aos`` markup.
+
+``collectstatic`` (main.storage.AssetStorage) concatenates and minifies each
+bundle into ``dist/``, fingerprints every file and writes ``.gz``/``.br``
+siblings. Templates include bundles with ``{% bundle %}`` (main/templatetags/
+assets.py), which links the single built file, or the individual sources
+while ASSETS_BUNDLE is off (DEBUG).
+"""
+import hashlib
+import posixpath
+import re
+
+from django.contrib.staticfiles import finders
+
+# Vendored file -> (pinned upstream URL, sha256); every file is committed
+VENDOR = {
+    'vendor/bootstrap-5.3.0/css/bootstrap.min.css': (
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+        '7f1d37f0d90b6385354c2ac10e2bb91563c46bd7a266ed351222ebcac8496c2a',
+    ),
+    'vendor/bootstrap-5.3.0/css/bootstrap.min.css.map': (
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css.map',
+        '68ae84685ddbce0297bbcea4b470bdf0c94f78b4254bddc154a4a38673852f03',
+    ),
+    'vendor/bootstrap-5.3.0/js/bootstrap.min.js': (
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.min.js',
+        '59e2e3c3c25802d3547328ea96e1eb91560dd5fa4bed3b5a930461691814c7cb',
+    ),
+    'vendor/bootstrap-5.3.0/js/bootstrap.min.js.map': (
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.min.js.map',
+        '7b3b36b5af7a04c57297b2feab377b04754ce2e5e6cd62a46fdfcfe8180a3a02',
+    ),
+    'vendor/fontawesome-6.4.0/css/all.min.css': (
+        'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css',
+        '1edb1725a9ea8ca4dcf2f5508cee183218aa1685e47c1b23056717f754f58ebf',
+    ),
+    'vendor/fontawesome-6.4.0/webfonts/fa-brands-400.woff2': (
+        'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/webfonts/fa-brands-400.woff2',
+        '748332090c4b8e20f95d0ff59f0be20fa9c889359d3b36d4b886d73376054207',
+    ),
+    'vendor/fontawesome-6.4.0/webfonts/fa-brands-400.ttf': (
+        'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/webfonts/fa-brands-400.ttf',
+        '20c4a58bc9d1d69e935d06f1528923646a715be5e218665655cade8f5f1b8c00',
+    ),
+    'vendor/fontawesome-6.4.0/webfonts/fa-regular-400.woff2': (
+        'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/webfonts/fa-regular-400.woff2',
+        '8e7e5ea1b15f62ab14dbd41768e8fbcd21cc859a4ea5da812457ee714299fb35',
+    ),
+    'vendor/fontawesome-6.4.0/webfonts/fa-regular-400.ttf': (
+        'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/webfonts/fa-regular-400.ttf',
+        '528d022dce6725f8a0811fd91d8e6513445c81ef33353a5c3234eab932551abf',
+    ),
+    'vendor/fontawesome-6.4.0/webfonts/fa-solid-900.woff2': (
+        'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/webfonts/fa-solid-900.woff2',
+        '7152a6933ee3d690ec2af3d09da9d701723d16aa3410a6d80f28ff8866f3b880',
+    ),
+    'vendor/fontawesome-6.4.0/webfonts/fa-solid-900.ttf': (
+        'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/webfonts/fa-solid-900.ttf',
+        '67a65763c7f80903d81603bbeb9049fc2bf28508479b83ed011fe24c71fa950a',
+    ),
+    'vendor/fontawesome-6.4.0/webfonts/fa-v4compatibility.woff2': (
+        'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/webfonts/fa-v4compatibility.woff2',
+        '694a17c3d9d6c05f8aac63c544615552a4b220e9a4de863d87341a6bcfc1bc8d',
+    ),
+    'vendor/fontawesome-6.4.0/webfonts/fa-v4compatibility.ttf': (
+        'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/webfonts/fa-v4compatibility.ttf',
+        '0515a423f828ce4e6accf92a2ea0b03d19d31cc86d9af0373291e1fd4db5f348',
+    ),
+}
+
+BUNDLES = {
+    'site.css': (
+        'vendor/bootstrap-5.3.0/css/bootstrap.min.css',
+        'vendor/fontawesome-6.4.0/css/all.min.css',
+        'main/css/base.css',
+    ),
+    'site.js': (
+        'vendor/bootstrap-5.3.0/js/bootstrap.min.js',
+    ),
+    'home.css': (
+        'vendor/fontawesome-6.4.0/css/all.min.css',
+        'main/css/home.css',
+    ),
+}
+
+BUNDLE_DIR = 'dist'
+
+CSS_URL_RE = re.compile(r'''url\(\s*(['"]?)(?!data:|https?:|//|/|#)([^'")]+)\1\s*\)''')
+SOURCE_MAP_RE = re.compile(r'^\s*(/\*#|//#)\s*sourceMappingURL=.*$', re.M)
+STRING_OR_COMMENT_RE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*(?!!).*?\*/''', re.S)
+
+
+class MissingAssetError(Exception):
+    pass
+
+
+def bundle_path(name):
+    return posixpath.join(BUNDLE_DIR, name)
+
+
+def sha256(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def read_source(path):
+    """Contents of a static source file, found the way collectstatic finds it"""
+    absolute = finders.find(path)
+    if absolute is None:
+        hint = ' (run "manage.py vendor_assets")' if path in VENDOR else ''
+        raise MissingAssetError(f'Static file {path!r} not found{hint}')
+    with open(absolute, encoding='utf-8') as handle:
+        return handle.read()
+
+
+def rebase_css_urls(css, source, target):
+    """Rewrite relative url()s in css from source's directory to target's"""
+    source_dir = posixpath.dirname(source)
+    target_dir = posixpath.dirname(target)
+
+    def rebase(match):
+        quote, url = match.groups()
+        absolute = posixpath.normpath(posixpath.join(source_dir, url))
+        return f'url({quote}{posixpath.relpath(absolute, target_dir)}{quote})'
+
+    return CSS_URL_RE.sub(rebase, css)
+
+
+def minify_css(css):
+    """Drop comments (but not /*! licences */) and redundant whitespace"""
+    strings = []
+
+    def protect(match):
+        if match.group(1) is None:
+            return ''
+        strings.append(match.group(1))
+        return f'"\0{len(strings) - 1}\0"'
+
+    css = STRING_OR_COMMENT_RE.sub(protect, css)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(';}', '}')
+    css = re.sub(r'"\0(\d+)\0"', lambda m: strings[int(m.group(1))], css)
+    return css.strip()
+
+
+def build_bundle(name):
+    """Concatenated, minified contents of bundle name"""
+    target = bundle_path(name)
+    parts = []
+    for source in BUNDLES[name]:
+        content = SOURCE_MAP_RE.sub('', read_source(source))
+        if name.endswith('.css'):
+            content = rebase_css_urls(content, source, target)
+            if not source.endswith('.min.css'):
+                content = minify_css(content)
+        parts.append(content.strip())
+    # ';' keeps concatenated scripts from running into each other.
+    return ('\n' if name.endswith('.css') else ';\n').join(parts) + '\n'
@@ -0,0 +1,271 @@
+"""
+Newsletter campaign delivery (``manage.py send_campaign``).
+
+The first send of a campaign snapshots its audience (active subscribers whose
+preferences match Campaign.audience) into CampaignDelivery rows. Those rows
+are the checkpoint: a delivery goes pending -> sending -> sent/failed, so an
+interrupted send resumes with the rows still pending and never repeats one
+that was sent. Rows left in "sending" by a crash may or may not have gone out;
+they are only retried when asked to (resend_unconfirmed), as are failed
+deliveries (retry_failed).
+
+Subject and bodies are Django templates rendered once per segment, the value
+of the subscriber preference named by Campaign.segment_key, not once per
+recipient. The main thread claims pending rows in batches and hands them to a
+pool of worker threads. Each worker keeps one email connection open for all
+its messages, and a shared RateLimiter caps messages per second across the
+pool. Checkpoint writes are retried while the database is busy; a worker that
+still fails stops, the main thread stops claiming rows, and send_campaign
+raises CampaignSendError. Any EMAIL_BACKEND works, including locmem in tests.
+
+Only one send of a given campaign should run at a time.
+"""
+import json
+import logging
+import queue
+import smtplib
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import DatabaseError, connections, transaction
+from django.template import Context, Template
+from django.utils import timezone
+
+from .models import Campaign, CampaignDelivery, Newsletter
+from .site_settings import get_site_settings
+
+logger = logging.getLogger(__name__)
+
+WORKERS = getattr(settings, 'CAMPAIGN_WORKERS', 4)
+# Messages per second across all workers; 0 means unlimited
+RATE = getattr(settings, 'CAMPAIGN_RATE', 10)
+BATCH_SIZE = getattr(settings, 'CAMPAIGN_BATCH_SIZE', 50)
+FROM_EMAIL = getattr(settings, 'NEWSLETTER_FROM_EMAIL', settings.DEFAULT_FROM_EMAIL)
+
+SEND_ERRORS = (smtplib.SMTPException, OSError)
+
+# Attempts at checkpointing a batch, e.g. while another thread holds the
+# SQLite write lock
+RECORD_ATTEMPTS = 5
+
+
+class CampaignSendError(RuntimeError):
+    """A sender thread stopped; counts is what was delivered until then"""
+
+    def __init__(self, errors, counts):
+        self.errors = errors
+        self.counts = counts
+        super().__init__(f'{len(errors)} sender thread(s) stopped: {errors[0]}')
+
+
+class RateLimiter:
+    """Spaces calls to wait() at least 1/rate seconds apart across threads"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            at = max(self._next, now)
+            self._next = at + self.interval
+        if at > now:
+            time.sleep(at - now)
+
+
+def segment_value(preferences, key):
+    if not key:
+        return ''
+    value = (preferences or {}).get(key, '')
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def audience(campaign):
+    """Active subscribers matching the campaign's preference filters"""
+    lookups = {f'preferences__{key}': value for key, value in campaign.audience.items()}
+    return Newsletter.objects.filter(is_active=True, **lookups)
+
+
+def prepare(campaign, batch_size=1000):
+    """Snapshot the audience of a draft campaign into pending deliveries"""
+    with transaction.atomic():
+        campaign = Campaign.objects.select_for_update().get(pk=campaign.pk)
+        if campaign.status != 'draft':
+            return campaign
+        rows = audience(campaign).order_by('pk').values_list('pk', 'email', 'preferences')
+        batch = []
+        for pk, email, preferences in rows.iterator(chunk_size=batch_size):
+            batch.append(CampaignDelivery(
+                campaign=campaign, subscriber_id=pk, email=email,
+                segment=segment_value(preferences, campaign.segment_key)[:100],
+            ))
+            if len(batch) >= batch_size:
+                CampaignDelivery.objects.bulk_create(batch, ignore_conflicts=True)
+                batch = []
+        CampaignDelivery.objects.bulk_create(batch, ignore_conflicts=True)
+        campaign.status = 'sending'
+        campaign.started_at = timezone.now()
+        campaign.save(update_fields=['status', 'started_at', 'updated_at'])
+    return campaign
+
+
+def render_segments(campaign, segments):
+    """Return {segment: (subject, text, html)}, rendering each segment once"""
+    templates = [Template(source) if source else None
+                 for source in (campaign.subject, campaign.body_text, campaign.body_html)]
+    company = get_site_settings().company
+    rendered = {}
+    for segment in segments:
+        context = Context({'campaign': campaign, 'segment': segment, 'company': company})
+        subject, text, html = (
+            template.render(context) if template is not None else '' for template in templates
+        )
+        # Header values must be a single line
+        rendered[segment] = (' '.join(subject.split()), text, html)
+    return rendered
+
+
+def _record(sent, failed):
+    for attempt in range(RECORD_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                if sent:
+                    CampaignDelivery.objects.filter(pk__in=sent).update(
+                        status='sent', sent_at=timezone.now(), error='')
+                for pk, error in failed.items():
+                    CampaignDelivery.objects.filter(pk=pk).update(status='failed', error=error)
+            return
+        except DatabaseError:
+            if attempt == RECORD_ATTEMPTS - 1:
+                raise
+            time.sleep(0.1 * 2 ** attempt)
+
+
+def _worker(batches, rendered, limiter, from_email, counts, errors, lock):
+    connection = get_connection()
+    try:
+        try:
+            connection.open()
+        except SEND_ERRORS as e:
+            logger.warning('Could not connect to the mail server: %s', e)
+        while (rows := batches.get()) is not None:
+            sent, failed = [], {}
+            for pk, email, segment in rows:
+                subject, text, html = rendered[segment]
+                message = EmailMultiAlternatives(subject, text, from_email, [email], connection=connection)
+                if html:
+                    message.attach_alternative(html, 'text/html')
+                limiter.wait()
+                try:
+                    message.send()
+                except SEND_ERRORS as e:
+                    failed[pk] = str(e)
+                    # The connection may be dead; start a fresh one
+                    connection.close()
+                    try:
+                        connection.open()
+                    except SEND_ERRORS:
+                        pass
+                else:
+                    sent.append(pk)
+            with lock:
+                counts['sent'] += len(sent)
+                counts['failed'] += len(failed)
+            _record(sent, failed)
+    except Exception as e:
+        # The batch stays "sending": its messages may have gone out
+        logger.exception('Campaign sender %s stopped', threading.current_thread().name)
+        with lock:
+            errors.append(e)
+    finally:
+        connection.close()
+        connections.close_all()
+
+
+def _put(batches, rows, threads):
+    """Queue rows for the workers; False if every worker has stopped"""
+    while True:
+        try:
+            batches.put(rows, timeout=1)
+            return True
+        except queue.Full:
+            if not any(thread.is_alive() for thread in threads):
+                return False
+
+
+def _release_queued(batches):
+    """Return batches no worker picked up to pending; none of them was sent"""
+    while True:
+        try:
+            rows = batches.get_nowait()
+        except queue.Empty:
+            return
+        if rows:
+            CampaignDelivery.objects.filter(pk__in=[row[0] for row in rows]).update(status='pending')
+
+
+def send_campaign(campaign, workers=WORKERS, rate=RATE, batch_size=BATCH_SIZE,
+                  resend_unconfirmed=False, retry_failed=False):
+    """
+    Deliver every pending message of campaign; return counts of sent and
+    failed. Raise CampaignSendError if a sender thread stopped.
+    """
+    campaign = prepare(campaign)
+    deliveries = CampaignDelivery.objects.filter(campaign=campaign)
+    if resend_unconfirmed:
+        deliveries.filter(status='sending').update(status='pending')
+    if retry_failed:
+        deliveries.filter(status='failed').update(status='pending', error='')
+
+    pending = deliveries.filter(status='pending')
+    rendered = render_segments(campaign, pending.order_by().values_list('segment', flat=True).distinct())
+
+    counts = {'sent': 0, 'failed': 0}
+    errors = []
+    lock = threading.Lock()
+    limiter = RateLimiter(rate)
+    batches = queue.Queue(maxsize=workers * 2)
+    threads = [
+        threading.Thread(
+            target=_worker, args=(batches, rendered, limiter, FROM_EMAIL, counts, errors, lock),
+            name=f'campaign-sender-{i}', daemon=True,
+        )
+        for i in range(max(1, workers))
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        last_id = 0
+        # Stop claiming once a sender has died; the others finish what is queued
+        while not errors:
+            rows = list(
+                pending.filter(id__gt=last_id).order_by('id')
+                .values_list('id', 'email', 'segment')[:batch_size]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            CampaignDelivery.objects.filter(pk__in=[row[0] for row in rows]).update(status='sending')
+            if not _put(batches, rows, threads):
+                CampaignDelivery.objects.filter(pk__in=[row[0] for row in rows]).update(status='pending')
+                break
+    finally:
+        for thread in threads:
+            # One stop sentinel per live worker; gives up once none is left
+            if thread.is_alive():
+                _put(batches, None, threads)
+        for thread in threads:
+            thread.join()
+        _release_queued(batches)
+
+    if errors:
+        raise CampaignSendError(errors, counts)
+    if not deliveries.filter(status__in=['pending', 'sending']).exists():
+        Campaign.objects.filter(pk=campaign.pk).update(status='sent', sent_at=timezone.now())
+    return counts
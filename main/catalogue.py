@@ -0,0 +1,286 @@
+"""
+Bulk import of catalogue content (``manage.py import_catalogue``).
+
+Input is JSON, an object with any of the SECTIONS keys mapping to lists of
+rows, or CSV, one file per section. Rows use model field names and refer to
+other rows by slug:
+
+* services: ``category`` is a service category slug;
+* projects: ``services_provided`` and ``team_members`` are lists of slugs
+  (``;``-separated in CSV).
+
+Sections are imported in dependency order, so a file can add a category and
+the services in it together. For each model the existing slugs are read once
+into a slug -> id map. Rows are validated in Python, all of them before
+anything is written, and then inserted with bulk_create in batches; project
+through-table rows go in with batched executemany() calls. Existing slugs are skipped, or updated
+in place with ``update=True``. Bulk inserts send no signals, so caches, proxy
+keys and the search index are refreshed once per model at the end.
+"""
+import csv
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import BooleanField
+from django.utils import timezone
+from django.utils.text import slugify
+
+from . import search
+from .invalidation import invalidate_model
+from .models import Partner, Project, Service, ServiceCategory, TeamMember
+
+BATCH_SIZE = 1000
+MAX_ERRORS = 50
+
+# Section name -> model, in the order sections are imported
+SECTIONS = {
+    'service_categories': ServiceCategory,
+    'services': Service,
+    'team_members': TeamMember,
+    'partners': Partner,
+    'projects': Project,
+}
+
+# Foreign keys given by slug: section -> {field: section of the target}
+FOREIGN_KEYS = {
+    'services': {'category': 'service_categories'},
+}
+
+# Many-to-many fields given by slug lists: section -> {field: section of the target}
+MANY_TO_MANY = {
+    'projects': {'services_provided': 'services', 'team_members': 'team_members'},
+}
+
+LIST_SEPARATOR = ';'
+
+
+class CatalogueError(Exception):
+    """The input could not be imported; nothing was written"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__('\n'.join(errors))
+
+
+def read_json(handle):
+    data = json.load(handle)
+    if not isinstance(data, dict) or not set(data) <= set(SECTIONS):
+        raise CatalogueError([f'Expected an object with keys among: {", ".join(SECTIONS)}'])
+    return data
+
+
+def read_csv(handle, section):
+    rows = []
+    for row in csv.DictReader(handle):
+        row = {key.strip(): (value or '').strip() for key, value in row.items() if key}
+        for field in MANY_TO_MANY.get(section, ()):
+            if field in row:
+                row[field] = [slug.strip() for slug in row[field].split(LIST_SEPARATOR) if slug.strip()]
+        rows.append(row)
+    return rows
+
+
+BOOLEAN_STRINGS = {
+    'true': True, 'yes': True, 'y': True, '1': True,
+    'false': False, 'no': False, 'n': False, '0': False, '': False,
+}
+
+
+def _clean(field, value, name, instance):
+    """Convert and validate a JSON or CSV value for field, as a model form would"""
+    if isinstance(field, BooleanField) and isinstance(value, str):
+        value = BOOLEAN_STRINGS.get(value.strip().lower(), value)
+    elif value == '' and field.null:
+        value = None
+    try:
+        return field.clean(value, instance)
+    except ValidationError as e:
+        raise ValidationError({name: e.messages})
+
+
+class CatalogueImport:
+    """Validate and bulk-insert catalogue rows; see the module docstring"""
+
+    def __init__(self, data, update=False, batch_size=BATCH_SIZE):
+        self.data = {section: data.get(section) or [] for section in SECTIONS}
+        self.update = update
+        self.batch_size = batch_size
+        self.errors = []
+        self.counts = {section: {'created': 0, 'updated': 0, 'skipped': 0} for section in SECTIONS}
+        # section -> {slug: pk} for rows already in the database
+        self.slugs = {}
+        # section -> {slug: (instance, fields given, {fk field: target slug})}
+        self.objects = {}
+        # section -> {field: {slug: [target slugs]}}
+        self.relations = {}
+        # section -> slugs that were in the database before the import
+        self.existing = {section: set() for section in SECTIONS}
+
+    def error(self, section, index, message):
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(f'{section}[{index}]: {message}')
+
+    def validate(self):
+        for section, model in SECTIONS.items():
+            if self.data[section] or any(
+                section in targets.values() for targets in (*FOREIGN_KEYS.values(), *MANY_TO_MANY.values())
+            ):
+                self.slugs[section] = dict(model.objects.values_list('slug', 'pk'))
+        for section in SECTIONS:
+            self._validate_section(section)
+            updated = sum(slug in self.slugs[section] for slug in self.objects[section])
+            self.counts[section]['updated'] = updated
+            self.counts[section]['created'] = len(self.objects[section]) - updated
+        if self.errors:
+            raise CatalogueError(self.errors)
+
+    def _known(self, section, slug):
+        return slug in self.slugs.get(section, ()) or slug in self.objects.get(section, {})
+
+    def _validate_section(self, section):
+        model = SECTIONS[section]
+        fields = {
+            field.name: field for field in model._meta.concrete_fields
+            if field.editable and not field.primary_key and not field.auto_created
+        }
+        title = 'title' if 'title' in fields else 'name'
+        foreign_keys = FOREIGN_KEYS.get(section, {})
+        many_to_many = MANY_TO_MANY.get(section, {})
+        objects = self.objects.setdefault(section, {})
+        relations = self.relations.setdefault(section, {field: {} for field in many_to_many})
+
+        for index, row in enumerate(self.data[section]):
+            if not isinstance(row, dict):
+                self.error(section, index, 'expected an object')
+                continue
+            unknown = set(row) - set(fields) - set(many_to_many)
+            if unknown:
+                self.error(section, index, f'unknown fields: {", ".join(sorted(unknown))}')
+                continue
+
+            values = {name: row[name] for name in row if name in fields}
+            if not values.get('slug'):
+                values['slug'] = slugify(row.get(title, ''))
+            slug = values['slug']
+            if not slug:
+                self.error(section, index, f'needs a slug or a {title}')
+                continue
+            if slug in objects:
+                self.error(section, index, f'duplicate slug "{slug}"')
+                continue
+            if slug in self.slugs[section] and not self.update:
+                self.counts[section]['skipped'] += 1
+                continue
+
+            broken = False
+            fk_slugs = {}
+            for name, target in foreign_keys.items():
+                target_slug = values.pop(name, None)
+                if target_slug in (None, ''):
+                    continue
+                if not self._known(target, target_slug):
+                    self.error(section, index, f'{name}: unknown {target} slug "{target_slug}"')
+                    broken = True
+                fk_slugs[name] = target_slug
+            for name, target in many_to_many.items():
+                target_slugs = row.get(name) or []
+                if isinstance(target_slugs, str):
+                    target_slugs = [target_slugs]
+                missing = [s for s in target_slugs if not self._known(target, s)]
+                if missing:
+                    self.error(section, index, f'{name}: unknown {target} slugs {", ".join(missing)}')
+                    broken = True
+                elif name in row:
+                    relations[name][slug] = target_slugs
+            if broken:
+                continue
+
+            instance = model()
+            try:
+                # Only what the row gives is checked; the rest keeps model defaults
+                for name, value in values.items():
+                    setattr(instance, fields[name].attname, _clean(fields[name], value, name, instance))
+            except ValidationError as e:
+                self.error(section, index, '; '.join(
+                    f'{name}: {" ".join(messages)}' for name, messages in e.message_dict.items()))
+                continue
+            given = [name for name in row if name in fields and name != 'slug']
+            objects[slug] = (instance, given, fk_slugs)
+
+    @transaction.atomic
+    def write(self):
+        for section, model in SECTIONS.items():
+            objects = self.objects[section]
+            if not objects:
+                continue
+            existing = self.slugs[section]
+            self.existing[section] = set(existing)
+            new, changed = [], {}
+            for slug, (instance, given, fk_slugs) in objects.items():
+                for name, target_slug in fk_slugs.items():
+                    setattr(instance, f'{name}_id', self.slugs[FOREIGN_KEYS[section][name]][target_slug])
+                if slug in existing:
+                    instance.pk = existing[slug]
+                    instance.updated_at = timezone.now()
+                    # Rows giving the same columns are updated together
+                    changed.setdefault(tuple(given), []).append(instance)
+                else:
+                    new.append(instance)
+
+            model.objects.bulk_create(new, batch_size=self.batch_size)
+            for given, instances in changed.items():
+                model.objects.bulk_update(instances, [*given, 'updated_at'], batch_size=self.batch_size)
+
+            # One more lookup so rows created above can be referenced by slug
+            self.slugs[section] = dict(model.objects.values_list('slug', 'pk'))
+
+        self._write_relations()
+
+    def _write_relations(self):
+        for section, fields in MANY_TO_MANY.items():
+            model = SECTIONS[section]
+            for name, target in fields.items():
+                links = self.relations[section][name]
+                if not links:
+                    continue
+                field = model._meta.get_field(name)
+                through = field.remote_field.through
+                source, target_column = f'{field.m2m_field_name()}_id', f'{field.m2m_reverse_field_name()}_id'
+                # Updated rows get exactly the relations the import lists
+                replaced = [self.slugs[section][slug] for slug in links if slug in self.existing[section]]
+                for start in range(0, len(replaced), self.batch_size):
+                    through.objects.filter(**{f'{source}__in': replaced[start:start + self.batch_size]}).delete()
+                # Two integer columns per row: a plain executemany() skips the
+                # per-object overhead of bulk_create for the largest table.
+                rows = [
+                    (self.slugs[section][slug], self.slugs[target][target_slug])
+                    for slug, target_slugs in links.items()
+                    for target_slug in dict.fromkeys(target_slugs)
+                ]
+                sql = 'INSERT INTO {} ({}, {}) VALUES (%s, %s)'.format(
+                    *map(connection.ops.quote_name, (through._meta.db_table, source, target_column)))
+                with connection.cursor() as cursor:
+                    for start in range(0, len(rows), self.batch_size):
+                        cursor.executemany(sql, rows[start:start + self.batch_size])
+
+    def refresh(self):
+        """Do once per model what the save signals would have done per row"""
+        for section, model in SECTIONS.items():
+            slugs = list(self.objects[section])
+            if not slugs:
+                continue
+            pks = [self.slugs[section][slug] for slug in slugs]
+            invalidate_model(model, *pks)
+            if section == 'service_categories' and self.update:
+                # Category names are part of each service's search document
+                search.reindex_queryset(Service.objects.filter(category__slug__in=slugs))
+            for start in range(0, len(pks), self.batch_size):
+                search.reindex_queryset(model.objects.filter(pk__in=pks[start:start + self.batch_size]))
+
+    def run(self, dry_run=False):
+        self.validate()
+        if not dry_run:
+            self.write()
+            self.refresh()
+        return self.counts
@@ -0,0 +1,11 @@
+from .site_settings import get_site_settings
+
+
+def site_settings(request):
+    """Expose the cached company profile, stats and SEO rows to templates"""
+    snapshot = get_site_settings()
+    return {
+        'site_settings': snapshot,
+        'company': snapshot.company,
+        'stats': snapshot.stats,
+    }
@@ -1,82 +1,35 @@
+from datetime import timedelta
 from django.shortcuts import render
 from django.contrib.admin.views.decorators import staff_member_required
-from django.db.models import Count, Q
 from django.utils import timezone
-from datetime import timedelta
-from .models import (
-    CompanyProfile, CompanyStats, Service, TeamMember, Partner,
-    NewsArticle, Project, ContactInquiry, Newsletter, Testimonial
-)
+from django.utils.dateparse import parse_date
+from .page_cache import page_cache
+from .rollups import daily_trends
+from .stats import get_dashboard_stats
+
+# Longest trend range the dashboard will read in one request
+MAX_TREND_DAYS = 366 * 5
 
 @staff_member_required
 def dashboard_stats(request):
     """Custom dashboard with statistics"""
     
-    # Get date ranges
-    today = timezone.now().date()
-    week_ago = today - timedelta(days=7)
-    month_ago = today - timedelta(days=30)
-    
-    # Basic counts
-    stats = {
-        'services': {
-            'total': Service.objects.count(),
-            'active': Service.objects.filter(is_active=True).count(),
-            'featured': Service.objects.filter(is_featured=True).count(),
-        },
-        'projects': {
-            'total': Project.objects.count(),
-            'public': Project.objects.filter(is_public=True).count(),
-            'completed': Project.objects.filter(status='completed').count(),
-            'in_progress': Project.objects.filter(status='construction').count(),
-        },
-        'team': {
-            'total': TeamMember.objects.count(),
-            'active': TeamMember.objects.filter(is_active=True).count(),
-            'featured': TeamMember.objects.filter(is_featured=True).count(),
-        },
-        'content': {
-            'news_articles': NewsArticle.objects.filter(is_published=True).count(),
-            'testimonials': Testimonial.objects.filter(is_approved=True).count(),
-            'partners': Partner.objects.filter(is_active=True).count(),
-        },
-        'inquiries': {
-            'total': ContactInquiry.objects.count(),
-            'this_week': ContactInquiry.objects.filter(created_at__gte=week_ago).count(),
-            'this_month': ContactInquiry.objects.filter(created_at__gte=month_ago).count(),
-            'unresponded': ContactInquiry.objects.filter(is_responded=False).count(),
-            'high_priority': ContactInquiry.objects.filter(priority='high', is_responded=False).count(),
-        },
-        'newsletter': {
-            'total_subscribers': Newsletter.objects.filter(is_active=True).count(),
-            'new_this_week': Newsletter.objects.filter(subscribed_date__gte=week_ago).count(),
-            'new_this_month': Newsletter.objects.filter(subscribed_date__gte=month_ago).count(),
-        }
-    }
-    
-    # Recent activities
-    recent_inquiries = ContactInquiry.objects.order_by('-created_at')[:5]
-    recent_subscribers = Newsletter.objects.order_by('-subscribed_date')[:5]
-    recent_articles = NewsArticle.objects.filter(is_published=True).order_by('-published_date')[:5]
+    # Counts, breakdowns and recent activity, cached for a short TTL
+    context = dict(get_dashboard_stats())
     
-    # Inquiry types breakdown
-    inquiry_types = ContactInquiry.objects.values('inquiry_type').annotate(
-        count=Count('id')
-    ).order_by('-count')
+    # Trends over a custom range are read from the daily rollups
+    start = parse_date(request.GET.get('start', '') or '')
+    end = parse_date(request.GET.get('end', '') or '')
+    if start or end:
+        end = end or timezone.localdate()
+        start = start or end - timedelta(days=30)
+        start = max(start, end - timedelta(days=MAX_TREND_DAYS))
+        if start <= end:
+            context['trends'] = daily_trends(start, end)
     
-    # Project status breakdown
-    project_status = Project.objects.values('status').annotate(
-        count=Count('id')
-    ).order_by('-count')
+    # Hit/miss counters of the page cache in the worker serving this request
+    context['page_cache'] = page_cache.stats()
     
-    context = {
-        'stats': stats,
-        'recent_inquiries': recent_inquiries,
-        'recent_subscribers': recent_subscribers,
-        'recent_articles': recent_articles,
-        'inquiry_types': inquiry_types,
-        'project_status': project_status,
-        'title': 'Dashboard Statistics',
-    }
+    context['title'] = 'Dashboard Statistics'
     
     return render(request, 'admin/dashboard_stats.html', context)
@@ -0,0 +1,204 @@
+"""
+Streaming CSV / JSONL / Excel-CSV exports of admin querysets.
+
+Each export walks its queryset once with ``.iterator(chunk_size=...)``:
+foreign keys come in through select_related and many-to-many titles are
+pre-aggregated into one column by a correlated subquery, so an export costs
+the same few queries and constant memory whatever the number of rows.
+Rows are yielded as text lines for a StreamingHttpResponse or a file.
+"""
+import csv
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.db.models import Aggregate, CharField, OuterRef, Subquery
+from django.http import StreamingHttpResponse
+
+from .models import ContactInquiry, Project
+
+CHUNK_SIZE = 2000
+
+# Separator between aggregated many-to-many titles
+TITLE_SEPARATOR = '; '
+
+# Spreadsheet apps run cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class Echo:
+    """File-like object whose write() returns the line, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+class GroupConcat(Aggregate):
+    """Concatenate the values of a group with TITLE_SEPARATOR"""
+    function = 'GROUP_CONCAT'
+    output_field = CharField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection,
+            template=f"%(function)s(%(expressions)s, '{TITLE_SEPARATOR}')", **extra_context)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection,
+            template=f"%(function)s(%(expressions)s SEPARATOR '{TITLE_SEPARATOR}')", **extra_context)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, function='STRING_AGG',
+            template=f"%(function)s(%(expressions)s::text, '{TITLE_SEPARATOR}')", **extra_context)
+
+
+def related_titles(field, title='title'):
+    """Subquery annotation joining the titles of a many-to-many field into one string"""
+    through = field.remote_field.through
+    source = field.m2m_field_name()
+    target = field.m2m_reverse_field_name()
+    return Subquery(
+        through.objects.filter(**{source: OuterRef('pk')})
+        .order_by().values(source)
+        .annotate(titles=GroupConcat(f'{target}__{title}'))
+        .values('titles')[:1],
+        output_field=CharField(),
+    )
+
+
+class Export:
+    """Columns of one model's export: (header, callable(obj) -> value)"""
+
+    def __init__(self, name, columns, prepare):
+        self.name = name
+        self.columns = columns
+        self.prepare = prepare
+
+    def rows(self, queryset, chunk_size=CHUNK_SIZE):
+        for obj in self.prepare(queryset).iterator(chunk_size=chunk_size):
+            yield [value(obj) for _, value in self.columns]
+
+    def headers(self):
+        return [header for header, _ in self.columns]
+
+
+def _inquiries(queryset):
+    return queryset.select_related('responded_by').annotate(
+        service_titles=related_titles(ContactInquiry._meta.get_field('services_interested')))
+
+
+def _projects(queryset):
+    return queryset.annotate(
+        service_titles=related_titles(Project._meta.get_field('services_provided')),
+        team_names=related_titles(Project._meta.get_field('team_members'), title='name'),
+    )
+
+
+EXPORTS = {
+    ContactInquiry: Export('inquiries', [
+        ('id', lambda obj: obj.pk),
+        ('created_at', lambda obj: obj.created_at),
+        ('inquiry_type', lambda obj: obj.inquiry_type),
+        ('priority', lambda obj: obj.priority),
+        ('name', lambda obj: obj.name),
+        ('email', lambda obj: obj.email),
+        ('phone', lambda obj: obj.phone),
+        ('company', lambda obj: obj.company),
+        ('subject', lambda obj: obj.subject),
+        ('message', lambda obj: obj.message),
+        ('services', lambda obj: obj.service_titles or ''),
+        ('project_budget', lambda obj: obj.project_budget),
+        ('project_timeline', lambda obj: obj.project_timeline),
+        ('is_responded', lambda obj: obj.is_responded),
+        ('responded_by', lambda obj: obj.responded_by.get_username() if obj.responded_by else ''),
+        ('response_date', lambda obj: obj.response_date),
+        ('response_notes', lambda obj: obj.response_notes),
+    ], _inquiries),
+    Project: Export('projects', [
+        ('id', lambda obj: obj.pk),
+        ('name', lambda obj: obj.name),
+        ('slug', lambda obj: obj.slug),
+        ('client', lambda obj: obj.client),
+        ('project_type', lambda obj: obj.project_type),
+        ('status', lambda obj: obj.status),
+        ('location', lambda obj: obj.location),
+        ('start_date', lambda obj: obj.start_date),
+        ('end_date', lambda obj: obj.end_date),
+        ('budget', lambda obj: obj.budget),
+        ('services', lambda obj: obj.service_titles or ''),
+        ('team_members', lambda obj: obj.team_names or ''),
+        ('is_featured', lambda obj: obj.is_featured),
+        ('is_public', lambda obj: obj.is_public),
+        ('created_at', lambda obj: obj.created_at),
+    ], _projects),
+}
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _json_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _excel_cell(value):
+    text = _text(value)
+    return "'" + text if text.startswith(FORMULA_PREFIXES) else text
+
+
+def stream_csv(export, queryset):
+    writer = csv.writer(Echo())
+    yield writer.writerow(export.headers())
+    for row in export.rows(queryset):
+        yield writer.writerow([_text(value) for value in row])
+
+
+def stream_excel_csv(export, queryset):
+    """CSV that Excel opens correctly: UTF-8 BOM, CRLF, no live formulas"""
+    writer = csv.writer(Echo(), dialect='excel')
+    yield '\ufeff' + writer.writerow(export.headers())
+    for row in export.rows(queryset):
+        yield writer.writerow([_excel_cell(value) for value in row])
+
+
+def stream_jsonl(export, queryset):
+    headers = export.headers()
+    for row in export.rows(queryset):
+        yield json.dumps(dict(zip(headers, map(_json_value, row))), ensure_ascii=False) + '\n'
+
+
+# format -> (stream function, content type, file extension)
+FORMATS = {
+    'csv': (stream_csv, 'text/csv; charset=utf-8', 'csv'),
+    'excel': (stream_excel_csv, 'text/csv; charset=utf-8', 'csv'),
+    'jsonl': (stream_jsonl, 'application/x-ndjson; charset=utf-8', 'jsonl'),
+}
+
+
+def stream(model, queryset, format):
+    """Yield the export of queryset in format as text chunks"""
+    stream_rows = FORMATS[format][0]
+    return stream_rows(EXPORTS[model], queryset)
+
+
+def filename(model, format):
+    suffix = '-excel' if format == 'excel' else ''
+    return f'{EXPORTS[model].name}{suffix}.{FORMATS[format][2]}'
+
+
+def export_response(model, queryset, format):
+    """StreamingHttpResponse downloading the export of queryset"""
+    response = StreamingHttpResponse(stream(model, queryset, format), content_type=FORMATS[format][1])
+    response['Content-Disposition'] = f'attachment; filename="{filename(model, format)}"'
+    return response
@@ -0,0 +1,147 @@
+"""
+Conditional GET (ETag / Last-Modified) for the public pages.
+
+Each page declares the models it is rendered from. Its validators are derived
+without touching the tables the page lists:
+
+* the ETag hashes the generation counters of those models (main/generations.py),
+  the site-settings snapshot version and the deployed templates/assets;
+* Last-Modified is the latest "changed at" stamp of those models, recorded by
+  main.signals on every save and delete and seeded from ``max(updated_at)``.
+
+A request whose If-None-Match / If-Modified-Since still matches gets a 304
+before the view runs a single query or renders a template. A response that
+embeds a CSRF token is specific to one visitor and gets no validators.
+
+Rendered pages also carry surrogate keys for a caching proxy (main/surrogate.py).
+"""
+import hashlib
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .generations import get_generations
+from .site_settings import get_site_settings
+from .surrogate import SITE_KEY, model_key, patch_surrogate_headers
+
+CHANGED_KEY = 'changed:{}'
+
+# Site-wide rows rendered on every page
+SITE_MODELS = ('main.CompanyProfile', 'main.CompanyStats', 'main.SEOSettings')
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def _release_stamp():
+    """mtime of the newest template or static manifest, i.e. the last deploy"""
+    paths = list((Path(__file__).resolve().parent / 'templates').rglob('*.html'))
+    if settings.STATIC_ROOT:
+        paths.append(Path(settings.STATIC_ROOT) / 'staticfiles.json')
+    mtimes = [path.stat().st_mtime for path in paths if path.exists()]
+    return datetime.fromtimestamp(int(max(mtimes, default=0)), tz=dt_timezone.utc)
+
+
+RELEASED_AT = _release_stamp()
+
+
+def _key(model):
+    return CHANGED_KEY.format(model._meta.label_lower)
+
+
+def mark_changed(model):
+    """Record that a row of model was just saved or deleted"""
+    cache.set(_key(model), timezone.now(), None)
+
+
+def last_changed(model):
+    """When model last changed; falls back to max(updated_at) on a cache miss"""
+    value = cache.get(_key(model))
+    if value is None:
+        value = model.objects.aggregate(latest=Max('updated_at'))['latest'] or EPOCH
+        cache.add(_key(model), value, None)
+        value = cache.get(_key(model), value)
+    return value
+
+
+def site_last_changed(snapshot):
+    """When the site-wide rows last changed, without querying them"""
+    keys = [CHANGED_KEY.format(label.lower()) for label in SITE_MODELS]
+    stamps = list(cache.get_many(keys).values())
+    if len(stamps) < len(keys):
+        # The snapshot already holds the rows; use their updated_at.
+        rows = [snapshot.company, snapshot.stats, *snapshot.seo.values()]
+        stamps.extend(row.updated_at for row in rows if row is not None)
+    return max(stamps, default=EPOCH)
+
+
+def page_etag(models):
+    parts = [
+        RELEASED_AT.isoformat(),
+        get_site_settings().version,
+        *(str(generation) for generation in get_generations(*models)),
+    ]
+    return quote_etag(hashlib.sha1('|'.join(parts).encode()).hexdigest()[:24])
+
+
+def page_validators(models):
+    """Return (etag, last_modified) for a page rendered from models"""
+    etag = page_etag(models)
+    last_modified = max(
+        RELEASED_AT,
+        site_last_changed(get_site_settings()),
+        *(last_changed(model) for model in models),
+    )
+    return etag, last_modified
+
+
+def conditional_page(*models, on_not_rendered=None, surrogate_models=None):
+    """
+    Answer GET/HEAD with 304 Not Modified while nothing in models changed.
+    on_not_rendered(request, *args, **kwargs) runs for side effects that must
+    happen even when the view is skipped (e.g. counting a view), here and on
+    main.page_cache hits.
+
+    Rendered pages get the surrogate keys of surrogate_models (default: models)
+    plus any object keys the view added with main.surrogate.add_keys.
+    """
+    if surrogate_models is None:
+        surrogate_models = models
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+
+            etag, last_modified = page_validators(models)
+            response = get_conditional_response(
+                request, etag=etag, last_modified=int(last_modified.timestamp()))
+            if response is not None:
+                if on_not_rendered is not None:
+                    on_not_rendered(request, *args, **kwargs)
+            else:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200 or request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+                    return response
+                patch_surrogate_headers(response, [
+                    SITE_KEY,
+                    *(model_key(model) for model in surrogate_models),
+                    *request.__dict__.get('surrogate_keys', ()),
+                ])
+            response.headers.setdefault('ETag', etag)
+            response.headers.setdefault('Last-Modified', http_date(last_modified.timestamp()))
+            # Always revalidate with the validators above.
+            patch_cache_control(response, no_cache=True)
+            return response
+        # Read by main.page_cache to tag cached copies of the page
+        wrapper.page_models = models
+        wrapper.on_not_rendered = on_not_rendered
+        return wrapper
+    return decorator
@@ -0,0 +1,72 @@
+"""
+Per-model generation counters kept in the shared cache.
+
+Every tracked model has a counter that main.signals bumps on save and delete.
+Cache keys built from the counters of the models a fragment depends on change
+as soon as one of those models is edited, so stale entries are never read and
+simply age out of the cache.
+"""
+import time
+
+from django.core.cache import cache
+
+GENERATION_KEY = 'generation:{}'
+
+# Cached fragments are keyed on generations, so the timeout only bounds how
+# long unreachable entries linger.
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+
+def _key(model):
+    return GENERATION_KEY.format(model._meta.label_lower)
+
+
+def _initial():
+    # Seed with a clock value so a culled counter never restarts at a number
+    # an old cache key was built with.
+    return time.time_ns()
+
+
+def get_generations(*models):
+    """Return the current generation of each model, in order"""
+    keys = [_key(model) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, _initial(), None)
+            found[key] = cache.get(key)
+    return tuple(found[key] for key in keys)
+
+
+def bump_generation(model):
+    """Invalidate every fragment that depends on model"""
+    key = _key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial(), None)
+
+
+def generation_key(prefix, *models):
+    """Build a cache key that changes whenever one of models changes"""
+    return '{}:{}'.format(prefix, '.'.join(str(g) for g in get_generations(*models)))
+
+
+def cached_section(name, queryset, *models):
+    """Return queryset as a list, cached until one of models changes"""
+    key = generation_key('section:{}'.format(name), *models)
+    rows = cache.get(key)
+    if rows is None:
+        rows = list(queryset)
+        cache.set(key, rows, FRAGMENT_TIMEOUT)
+    return rows
+
+
+def cached_count(name, queryset, *models):
+    """Return queryset.count(), cached until one of models changes"""
+    key = generation_key('count:{}'.format(name), *models)
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, FRAGMENT_TIMEOUT)
+    return count
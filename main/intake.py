@@ -0,0 +1,260 @@
+"""
+Spooled intake of contact form submissions.
+
+contact() only validates a submission and appends it to a local spool
+directory, so the public form never waits on (or fails with) a locked
+database. ``manage.py process_inquiries`` drains the spool: it claims files,
+drops duplicates by content hash and writes the rest in one transaction per
+batch, with bulk_create for both the inquiries and their service rows.
+
+Spool layout under INTAKE_SPOOL_DIR::
+
+    tmp/         submissions being written
+    incoming/    complete submissions, one JSON file each, oldest name first
+    processing/  files claimed by a worker (moved back after a crash)
+    failed/      files that could not be parsed
+
+Every step is an atomic rename, so several web and worker processes can
+share the spool and a submission is never lost or written twice.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import DatabaseError, connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ContactInquiry, Service
+from .rollups import InquiryRollup, rewind_watermark
+
+logger = logging.getLogger(__name__)
+
+SPOOL_DIR = Path(getattr(settings, 'INTAKE_SPOOL_DIR', settings.BASE_DIR / 'spool' / 'inquiries'))
+BATCH_SIZE = getattr(settings, 'INTAKE_BATCH_SIZE', 200)
+# A submission repeating one from within this window is dropped.
+DEDUPE_WINDOW = timedelta(seconds=getattr(settings, 'INTAKE_DEDUPE_WINDOW', 60 * 60 * 24))
+# Claimed files untouched for this long belonged to a crashed worker.
+VISIBILITY_TIMEOUT = getattr(settings, 'INTAKE_VISIBILITY_TIMEOUT', 300)
+
+REQUIRED_FIELDS = ('name', 'email', 'subject', 'message')
+TEXT_FIELDS = (
+    'inquiry_type', 'name', 'email', 'phone', 'company', 'subject', 'message',
+    'project_budget', 'project_timeline',
+)
+
+
+def _dir(name):
+    path = SPOOL_DIR / name
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def clean_submission(post):
+    """Return the inquiry fields from POST data; raise ValidationError if unusable"""
+    data = {
+        'inquiry_type': post.get('inquiry_type', 'general'),
+        'name': post.get('name', ''),
+        'email': post.get('email', ''),
+        'phone': post.get('phone', ''),
+        'company': post.get('company', ''),
+        'subject': post.get('subject', ''),
+        'message': post.get('message', ''),
+        'project_budget': post.get('budget', ''),
+        'project_timeline': post.get('timeline', ''),
+    }
+    data = {name: value.strip() for name, value in data.items()}
+
+    errors = {}
+    for name in REQUIRED_FIELDS:
+        if not data[name]:
+            errors[name] = 'This field is required.'
+    if data['inquiry_type'] not in dict(ContactInquiry.INQUIRY_TYPES):
+        errors['inquiry_type'] = 'Unknown inquiry type.'
+    if data['email'] and 'email' not in errors:
+        try:
+            validate_email(data['email'])
+        except ValidationError:
+            errors['email'] = 'Enter a valid email address.'
+    for name in TEXT_FIELDS:
+        max_length = ContactInquiry._meta.get_field(name).max_length
+        if max_length and len(data[name]) > max_length:
+            errors[name] = f'At most {max_length} characters.'
+    try:
+        data['services'] = sorted({int(pk) for pk in post.getlist('services')})
+    except ValueError:
+        errors['services'] = 'Unknown service.'
+    if errors:
+        raise ValidationError(errors)
+    return data
+
+
+def content_hash(data):
+    """Hash of what makes two submissions the same inquiry"""
+    parts = [
+        data['email'].lower(), data['inquiry_type'], data['subject'], data['message'],
+        ','.join(str(pk) for pk in data['services']),
+    ]
+    return hashlib.sha256('\x1f'.join(parts).encode()).hexdigest()
+
+
+def submit(data):
+    """Durably append a cleaned submission to the spool"""
+    name = f'{time.time_ns():020d}-{uuid.uuid4().hex}.json'
+    tmp = _dir('tmp') / name
+    with open(tmp, 'w', encoding='utf-8') as handle:
+        json.dump({**data, 'submitted_at': timezone.now().isoformat()}, handle)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp, _dir('incoming') / name)
+
+
+def pending():
+    """Number of submissions waiting in the spool"""
+    return len(os.listdir(_dir('incoming'))) + len(os.listdir(_dir('processing')))
+
+
+def recover(visibility_timeout=None):
+    """Return files claimed by crashed workers to the queue"""
+    if visibility_timeout is None:
+        visibility_timeout = VISIBILITY_TIMEOUT
+    cutoff = time.time() - visibility_timeout
+    for path in _dir('processing').iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                os.replace(path, _dir('incoming') / path.name)
+        except FileNotFoundError:
+            pass
+
+
+def claim(limit=None):
+    """Move up to limit of the oldest spooled files to processing/ and return them"""
+    claimed = []
+    processing = _dir('processing')
+    for name in sorted(os.listdir(_dir('incoming'))):
+        if len(claimed) >= (limit or BATCH_SIZE):
+            break
+        target = processing / name
+        try:
+            os.replace(SPOOL_DIR / 'incoming' / name, target)
+        except FileNotFoundError:
+            # Claimed by another worker first
+            continue
+        os.utime(target)
+        claimed.append(target)
+    return claimed
+
+
+def release(paths):
+    """Return claimed files to the queue untouched"""
+    for path in paths:
+        try:
+            os.replace(path, _dir('incoming') / path.name)
+        except FileNotFoundError:
+            pass
+
+
+def _load(paths):
+    submissions = []
+    for path in paths:
+        try:
+            with open(path, encoding='utf-8') as handle:
+                submissions.append((path, json.load(handle)))
+        except (ValueError, OSError) as e:
+            logger.error('Unreadable inquiry %s: %s', path.name, e)
+            os.replace(path, _dir('failed') / path.name)
+    return submissions
+
+
+def _submitted_at(data):
+    try:
+        return parse_datetime(data.get('submitted_at') or '')
+    except ValueError:
+        return None
+
+
+def persist(paths):
+    """Write the claimed files as inquiries; return (created, duplicates)"""
+    submissions = _load(paths)
+    if not submissions:
+        return 0, 0
+
+    since = timezone.now() - DEDUPE_WINDOW
+    hashes = [content_hash(data) for _, data in submissions]
+    seen = set(
+        ContactInquiry.objects.filter(content_hash__in=set(hashes), created_at__gte=since)
+        .values_list('content_hash', flat=True)
+    )
+    service_ids = {pk for _, data in submissions for pk in data['services']}
+    known_services = set(Service.objects.filter(pk__in=service_ids).values_list('pk', flat=True))
+
+    inquiries = []
+    submitted = []
+    services = []
+    for (path, data), digest in zip(submissions, hashes):
+        if digest in seen:
+            continue
+        seen.add(digest)
+        inquiries.append(ContactInquiry(content_hash=digest, **{name: data[name] for name in TEXT_FIELDS}))
+        submitted.append(_submitted_at(data))
+        services.append([pk for pk in data['services'] if pk in known_services])
+
+    Through = ContactInquiry.services_interested.through
+    with transaction.atomic():
+        ContactInquiry.objects.bulk_create(inquiries)
+        # bulk_create stamps created_at with the time of this run
+        # (auto_now_add); date each inquiry by when it was submitted instead.
+        for inquiry, submitted_at in zip(inquiries, submitted):
+            inquiry.created_at = submitted_at or inquiry.created_at
+        ContactInquiry.objects.bulk_update(inquiries, ['created_at'])
+        if inquiries:
+            # A lagging worker may date rows into days already rolled up
+            rewind_watermark(InquiryRollup.name, min(timezone.localdate(i.created_at) for i in inquiries))
+        Through.objects.bulk_create([
+            Through(contactinquiry_id=inquiry.pk, service_id=pk)
+            for inquiry, pks in zip(inquiries, services)
+            for pk in pks
+        ])
+
+    for path, _ in submissions:
+        path.unlink(missing_ok=True)
+    return len(inquiries), len(submissions) - len(inquiries)
+
+
+def work(stop=None, once=False, poll_interval=1.0, batch_size=None):
+    """Drain the spool until stop is set (or it is empty, with once); return inquiries created"""
+    created = 0
+    try:
+        recover()
+        while stop is None or not stop.is_set():
+            paths = claim(batch_size)
+            if not paths:
+                if once:
+                    break
+                time.sleep(poll_interval)
+                recover()
+                continue
+            try:
+                batch_created, duplicates = persist(paths)
+            except DatabaseError as e:
+                # Most likely a locked database; leave the batch for later.
+                logger.warning('Could not store %d inquiries, retrying: %s', len(paths), e)
+                release(paths)
+                if once:
+                    raise
+                time.sleep(poll_interval)
+                continue
+            created += batch_created
+            if duplicates:
+                logger.info('Dropped %d duplicate inquiries', duplicates)
+    finally:
+        connections.close_all()
+    return created
@@ -0,0 +1,39 @@
+"""
+Invalidation of everything cached from a model's rows.
+
+A change to a model outdates its fragment generations (main/generations.py),
+its "changed at" stamp (main/freshness.py), the pages the in-process page
+cache tagged with it (main/page_cache.py) and the proxy's surrogate keys
+(main/surrogate.py). Save signals, admin bulk actions, image processing and
+the bulk importers all go through invalidate_model().
+"""
+from django.db import transaction
+
+from .freshness import SITE_MODELS, mark_changed
+from .generations import bump_generation
+from .page_cache import page_cache
+from .surrogate import SITE_KEY, model_key, purge
+
+
+def _refresh(model):
+    bump_generation(model)
+    mark_changed(model)
+    if model._meta.label in SITE_MODELS:
+        page_cache.clear()
+    else:
+        page_cache.purge_model(model)
+
+
+def invalidate_model(model, *pks):
+    """
+    Drop what is cached from model and from its rows pks, once the current
+    transaction commits: a request served in between would cache the old rows
+    under the new generation, and validators would pass them.
+    """
+    transaction.on_commit(lambda: _refresh(model))
+    if model._meta.label in SITE_MODELS:
+        # Every page shows the site-wide rows
+        purge(SITE_KEY)
+    else:
+        key = model_key(model)
+        purge(key, *(f'{key}-{pk}' for pk in pks))
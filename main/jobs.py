@@ -0,0 +1,139 @@
+"""
+Database-backed job queue.
+
+Work that is too slow for a request (image processing, for now) is stored as a
+Job row and executed by ``manage.py process_jobs``. There is no broker: the
+worker claims a job with a conditional UPDATE, so any number of threads or
+processes can share the table.
+
+* ``key`` is unique, so enqueueing the same work twice is a no-op.
+* A claimed job is leased for JOBS_VISIBILITY_TIMEOUT seconds. If the worker
+  dies the lease runs out and another worker picks the job up again.
+* A failing job is retried with exponential backoff (JOBS_RETRY_BACKOFF
+  seconds, doubled per attempt) until ``max_attempts`` is reached. Raise
+  FatalJobError to fail it straight away.
+"""
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+VISIBILITY_TIMEOUT = getattr(settings, 'JOBS_VISIBILITY_TIMEOUT', 300)
+RETRY_BACKOFF = getattr(settings, 'JOBS_RETRY_BACKOFF', 30)
+MAX_ATTEMPTS = getattr(settings, 'JOBS_MAX_ATTEMPTS', 5)
+
+# Ready jobs looked at per claim; others may win the race for some of them.
+CLAIM_BATCH = 10
+
+# kind -> callable(payload)
+HANDLERS = {}
+
+
+class FatalJobError(Exception):
+    """Raised by a handler when retrying the job cannot help"""
+
+
+def handler(kind):
+    """Register the decorated function as the handler for kind"""
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+    return register
+
+
+def enqueue(kind, payload, key, max_attempts=None):
+    """Queue a job unless one with the same key exists; return (job, created)"""
+    return Job.objects.get_or_create(key=key, defaults={
+        'kind': kind,
+        'payload': payload,
+        'max_attempts': max_attempts or MAX_ATTEMPTS,
+    })
+
+
+def _ready(now):
+    return Q(status='pending', available_at__lte=now) | Q(status='running', locked_until__lte=now)
+
+
+def claim(visibility_timeout=None):
+    """Lease the next ready job to the caller, or return None"""
+    timeout = VISIBILITY_TIMEOUT if visibility_timeout is None else visibility_timeout
+    now = timezone.now()
+    candidates = (
+        Job.objects.filter(_ready(now))
+        .order_by('available_at', 'pk')
+        .values_list('pk', flat=True)[:CLAIM_BATCH]
+    )
+    for pk in list(candidates):
+        claimed = Job.objects.filter(_ready(now), pk=pk).update(
+            status='running',
+            locked_until=now + timedelta(seconds=timeout),
+            attempts=F('attempts') + 1,
+            updated_at=now,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def run_job(job):
+    """Execute a claimed job and record the outcome; return True on success"""
+    # Only write back while we still hold the lease.
+    lease = Job.objects.filter(pk=job.pk, status='running', locked_until=job.locked_until)
+    func = HANDLERS.get(job.kind)
+    if func is None:
+        lease.update(status='failed', locked_until=None, last_error=f'No handler for {job.kind!r}',
+                     updated_at=timezone.now())
+        return False
+    if job.attempts > job.max_attempts:
+        # Lease expired on the final attempt (the worker died or hung).
+        lease.update(status='failed', locked_until=None, updated_at=timezone.now())
+        return False
+
+    try:
+        func(job.payload)
+    except Exception as e:
+        now = timezone.now()
+        error = traceback.format_exc()
+        if isinstance(e, FatalJobError) or job.attempts >= job.max_attempts:
+            lease.update(status='failed', locked_until=None, last_error=error, updated_at=now)
+        else:
+            delay = RETRY_BACKOFF * 2 ** (job.attempts - 1)
+            lease.update(status='pending', locked_until=None, last_error=error, updated_at=now,
+                         available_at=now + timedelta(seconds=delay))
+        return False
+
+    lease.update(status='done', locked_until=None, last_error='', updated_at=timezone.now())
+    return True
+
+
+def work(stop=None, once=False, poll_interval=1.0, visibility_timeout=None):
+    """
+    Claim and run jobs until stop (a threading/multiprocessing Event) is set,
+    or, with once, until the queue is empty. Return the number of jobs run.
+    """
+    processed = 0
+    wait = stop.wait if stop is not None else time.sleep
+    try:
+        while stop is None or not stop.is_set():
+            try:
+                job = claim(visibility_timeout)
+            except DatabaseError:
+                # e.g. SQLite "database is locked" under concurrent workers
+                wait(poll_interval)
+                continue
+            if job is None:
+                if once:
+                    break
+                wait(poll_interval)
+                continue
+            run_job(job)
+            processed += 1
+    finally:
+        connections.close_all()
+    return processed
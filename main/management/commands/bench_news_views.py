@@ -0,0 +1,73 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connections
+from django.shortcuts import get_object_or_404
+
+from main.models import NewsArticle
+from main.view_counter import flush_views
+
+BENCH_SLUG = 'benchmark-view-counter'
+
+
+class Command(BaseCommand):
+    help = ('Measure /news/<slug>/ read throughput under parallel clients, comparing the '
+            'legacy read-modify-write view counter with the write-behind buffer')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=8, help='Number of parallel clients')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per client')
+
+    def handle(self, *args, **options):
+        article, _ = NewsArticle.objects.get_or_create(
+            slug=BENCH_SLUG, defaults={'title': 'View counter benchmark', 'is_published': True}
+        )
+        try:
+            for mode in ('save', 'buffered'):
+                NewsArticle.objects.filter(pk=article.pk).update(views_count=0)
+                self.run_mode(mode, options['clients'], options['requests'])
+        finally:
+            flush_views()
+            article.delete()
+
+    def run_mode(self, mode, clients, requests):
+        errors = []
+
+        def client():
+            try:
+                for _ in range(requests):
+                    try:
+                        self.read_article(mode)
+                    except DatabaseError as e:
+                        errors.append(e)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=client) for _ in range(clients)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        flush_views()
+
+        total = clients * requests
+        recorded = NewsArticle.objects.get(slug=BENCH_SLUG).views_count
+        self.stdout.write(
+            f'{mode:>9}: {total / elapsed:8.0f} req/s  '
+            f'errors={len(errors)}  views recorded={recorded}/{total}  lost={total - recorded}'
+        )
+
+    def read_article(self, mode):
+        """The database work news_detail() does for one request"""
+        article = get_object_or_404(NewsArticle, slug=BENCH_SLUG, is_published=True)
+        if mode == 'save':
+            article.views_count += 1
+            article.save(update_fields=['views_count'])
+        else:
+            article.increment_views()
+        list(NewsArticle.objects.filter(
+            article_type=article.article_type, is_published=True
+        ).exclude(id=article.id)[:3])
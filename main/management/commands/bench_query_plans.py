@@ -0,0 +1,142 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from main.models import Service, NewsArticle, Project, ContactInquiry
+
+
+def view_queries():
+    """The filter/order patterns the public views and dashboard issue"""
+    return {
+        'home: featured services': Service.objects.filter(is_featured=True, is_active=True)[:6],
+        'services: active list': Service.objects.filter(is_active=True),
+        'news: first page': NewsArticle.objects.filter(is_published=True).order_by('-published_date', '-id')[:7],
+        'news: by type': NewsArticle.objects.filter(is_published=True, article_type='award').order_by('-published_date', '-id')[:7],
+        'news: featured': NewsArticle.objects.filter(is_featured=True, is_published=True)[:3],
+        'projects: first page': Project.objects.filter(is_public=True).order_by('-start_date', '-id')[:10],
+        'projects: type + status': Project.objects.filter(
+            is_public=True, project_type='industrial', status='completed'
+        ).order_by('-start_date', '-id')[:10],
+        'home: featured projects': Project.objects.filter(is_featured=True, is_public=True)[:3],
+        'dashboard: urgent open inquiries': ContactInquiry.objects.filter(
+            is_responded=False, priority='urgent'
+        ).order_by('-created_at')[:50],
+        'dashboard: recent inquiries': ContactInquiry.objects.order_by('-created_at')[:5],
+    }
+
+
+class Command(BaseCommand):
+    help = ('Seed a scratch database and report EXPLAIN plans and latencies of the public '
+            'queries before and after the access-path indexes')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20000, help='Rows seeded per large table')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the data')
+
+    def handle(self, *args, **options):
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.stdout.write(f'Seeding {options["rows"]} rows per table...')
+            self.seed(options['rows'], random.Random(options['seed']))
+
+            indexes = [
+                (model, index)
+                for model in apps.get_app_config('main').get_models()
+                for index in model._meta.indexes
+            ]
+            with connection.schema_editor() as editor:
+                for model, index in indexes:
+                    editor.remove_index(model, index)
+            before = self.measure(options['repeat'])
+
+            with connection.schema_editor() as editor:
+                for model, index in indexes:
+                    editor.add_index(model, index)
+            after = self.measure(options['repeat'])
+
+            self.report(before, after)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def seed(self, rows, rng):
+        now = timezone.now()
+        Service.objects.bulk_create([
+            Service(
+                title=f'Service {i}', slug=f'service-{i}', order=rng.randrange(100),
+                is_active=rng.random() < 0.9, is_featured=rng.random() < 0.02,
+            )
+            for i in range(rows // 10)
+        ], batch_size=1000)
+        NewsArticle.objects.bulk_create([
+            NewsArticle(
+                title=f'Article {i}', slug=f'article-{i}',
+                article_type=rng.choice(NewsArticle.ARTICLE_TYPES)[0],
+                is_published=rng.random() < 0.9, is_featured=rng.random() < 0.02,
+                published_date=now - timedelta(minutes=rng.randrange(60 * 24 * 365 * 5)),
+            )
+            for i in range(rows)
+        ], batch_size=1000)
+        Project.objects.bulk_create([
+            Project(
+                name=f'Project {i}', slug=f'project-{i}',
+                project_type=rng.choice(Project.PROJECT_TYPES)[0],
+                status=rng.choice(Project.PROJECT_STATUS)[0],
+                is_public=rng.random() < 0.9, is_featured=rng.random() < 0.02,
+                start_date=(now - timedelta(days=rng.randrange(365 * 15))).date(),
+            )
+            for i in range(rows)
+        ], batch_size=1000)
+        inquiries = ContactInquiry.objects.bulk_create([
+            ContactInquiry(
+                name=f'Visitor {i}', subject='Inquiry',
+                priority=rng.choice(ContactInquiry.PRIORITY_LEVELS)[0],
+                is_responded=rng.random() < 0.85,
+            )
+            for i in range(rows)
+        ], batch_size=1000)
+        # created_at is auto_now_add; spread it over five years
+        for inquiry in inquiries:
+            inquiry.created_at = now - timedelta(minutes=rng.randrange(60 * 24 * 365 * 5))
+        ContactInquiry.objects.bulk_update(inquiries, ['created_at'], batch_size=1000)
+        if connection.vendor in ('sqlite', 'postgresql'):
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+    def measure(self, repeat):
+        results = {}
+        for name, queryset in view_queries().items():
+            plan = queryset.explain()
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append(time.perf_counter() - started)
+            results[name] = (statistics.median(timings) * 1000, plan)
+        return results
+
+    def report(self, before, after):
+        self.stdout.write('')
+        self.stdout.write(f'{"query":<36} {"before ms":>10} {"after ms":>10} {"speedup":>8}')
+        for name in before:
+            before_ms, _ = before[name]
+            after_ms, _ = after[name]
+            speedup = before_ms / after_ms if after_ms else float('inf')
+            self.stdout.write(f'{name:<36} {before_ms:>10.2f} {after_ms:>10.2f} {speedup:>7.1f}x')
+
+        for name in before:
+            self.stdout.write('')
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write('  before:')
+            for line in before[name][1].splitlines():
+                self.stdout.write(f'    {line}')
+            self.stdout.write('  after:')
+            for line in after[name][1].splitlines():
+                self.stdout.write(f'    {line}')
@@ -1,5 +1,6 @@
 import os
 import random
+import time
 from datetime import timedelta
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
@@ -11,6 +12,7 @@ from main.models import (
     CompanyProfile, CompanyStats, ServiceCategory, Service, TeamMember,
     Partner, NewsArticle, Project, ContactInquiry, Newsletter, Testimonial, SEOSettings
 )
+from main import sample_data
 
 class Command(BaseCommand):
     help = 'Create sample data for the NUPO Consult website'
@@ -21,8 +23,37 @@ class Command(BaseCommand):
             action='store_true',
             help='Delete existing data before creating new sample data',
         )
+        parser.add_argument(
+            '--scale',
+            type=int,
+            default=0,
+            help='Also generate this many units of bulk data for load testing; each unit is '
+                 + ', '.join(f'{count} {section}' for section, count in sample_data.VOLUMES.items()),
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            help='Random seed; the same seed and starting database give the same data',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Worker processes writing the bulk data',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=sample_data.BATCH_SIZE,
+            help='Bulk rows per chunk; each chunk is written in one transaction',
+        )
 
     def handle(self, *args, **options):
+        seed = options['seed']
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        random.seed(seed)
+
         if options['reset']:
             self.stdout.write('Deleting existing data...')
             self.delete_existing_data()
@@ -61,15 +92,29 @@ class Command(BaseCommand):
         
         # Create SEO settings
         self.create_seo_settings()
+
+        if options['scale'] > 0:
+            self.create_bulk_data(options['scale'], seed, options['workers'], options['batch_size'])
         
         self.stdout.write(self.style.SUCCESS('✅ Sample data created successfully!'))
         self.stdout.write('You can now access the admin at /admin/ and the website at /')
 
+    def create_bulk_data(self, scale, seed, workers, batch_size):
+        self.stdout.write(f'Generating bulk data at scale {scale} with seed {seed}...')
+        started = time.monotonic()
+        counts = sample_data.generate(scale, seed, workers=workers, batch_size=batch_size)
+        for section, count in counts.items():
+            self.stdout.write(f'  ✓ Created {count} {section}')
+        self.stdout.write(f'  Took {time.monotonic() - started:.1f}s')
+
     def delete_existing_data(self):
         """Delete existing data (except superuser)"""
+        # The models bulk data goes into are cleared without per-row signals
+        for model, count in sample_data.clear().items():
+            self.stdout.write(f'  Deleted {count} {model._meta.verbose_name_plural}')
+
         models_to_clear = [
-            ContactInquiry, Newsletter, Testimonial, Project, NewsArticle,
-            Partner, TeamMember, Service, ServiceCategory, SEOSettings,
+            Testimonial, Partner, TeamMember, Service, ServiceCategory, SEOSettings,
             CompanyStats, CompanyProfile
         ]
         
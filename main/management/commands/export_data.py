@@ -0,0 +1,50 @@
+import sys
+
+from django.core.exceptions import FieldError, ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from main.exports import FORMATS, stream
+from main.models import ContactInquiry, Project
+
+MODELS = {
+    'inquiries': ContactInquiry,
+    'projects': Project,
+}
+
+
+class Command(BaseCommand):
+    help = 'Stream contact inquiries or projects to CSV, Excel-compatible CSV or JSON Lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=sorted(MODELS))
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv')
+        parser.add_argument('--output', '-o', default='-', help='File to write, or - for standard output')
+        parser.add_argument(
+            '--filter',
+            action='append',
+            default=[],
+            metavar='LOOKUP=VALUE',
+            help='Queryset filter, e.g. is_responded=False or created_at__date__gte=2025-01-01 (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        model = MODELS[options['model']]
+        lookups = {}
+        for item in options['filter']:
+            lookup, sep, value = item.partition('=')
+            if not sep:
+                raise CommandError(f'Filters look like LOOKUP=VALUE, not "{item}"')
+            lookups[lookup] = value
+        try:
+            queryset = model.objects.filter(**lookups).order_by('pk')
+            chunks = stream(model, queryset, options['format'])
+            if options['output'] == '-':
+                for chunk in chunks:
+                    sys.stdout.write(chunk)
+            else:
+                with open(options['output'], 'w', encoding='utf-8', newline='') as handle:
+                    for chunk in chunks:
+                        handle.write(chunk)
+                self.stderr.write(self.style.SUCCESS(f'✅ Exported {options["model"]} to {options["output"]}'))
+        except (FieldError, ValidationError, ValueError) as e:
+            raise CommandError(str(e))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from main.renditions import (
+    IMAGE_FIELDS, ensure_renditions, ensure_thumbnail, generate_renditions, generate_thumbnail
+)
+
+
+class Command(BaseCommand):
+    help = 'Backfill responsive JPEG/WebP renditions and admin thumbnails for existing uploaded images'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate renditions that already exist',
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        for model, field_names in IMAGE_FIELDS.items():
+            for field_name in field_names:
+                queryset = model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+                for obj in queryset.only('pk', field_name).iterator():
+                    fieldfile = getattr(obj, field_name)
+                    try:
+                        if options['force']:
+                            widths = generate_renditions(fieldfile)
+                            generate_thumbnail(fieldfile)
+                        else:
+                            widths = ensure_renditions(fieldfile)
+                            ensure_thumbnail(fieldfile)
+                    except (OSError, ValueError) as e:
+                        self.stdout.write(self.style.WARNING(f'  ✗ {fieldfile.name}: {e}'))
+                        continue
+                    if widths:
+                        total += 1
+                        self.stdout.write(f'  ✓ {fieldfile.name}: {", ".join(str(w) for w in widths)}px')
+        self.stdout.write(self.style.SUCCESS(f'✅ Generated renditions for {total} images'))
@@ -0,0 +1,76 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.catalogue import BATCH_SIZE, SECTIONS, CatalogueError, CatalogueImport, read_csv, read_json
+
+
+class Command(BaseCommand):
+    help = 'Bulk import service categories, services, team members, partners and projects from JSON or CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            nargs='+',
+            help='JSON files keyed by section, or CSV files named after their section (e.g. projects.csv)',
+        )
+        parser.add_argument(
+            '--section',
+            choices=list(SECTIONS),
+            help='Section of the CSV files, when their names do not say',
+        )
+        parser.add_argument(
+            '--update',
+            action='store_true',
+            help='Update rows whose slug already exists instead of skipping them',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Rows per INSERT/UPDATE statement',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate the input and report what would change, without writing',
+        )
+
+    def handle(self, *args, **options):
+        data = {section: [] for section in SECTIONS}
+        try:
+            for path in map(Path, options['paths']):
+                with open(path, encoding='utf-8-sig', newline='') as handle:
+                    if path.suffix.lower() == '.json':
+                        for section, rows in read_json(handle).items():
+                            data[section].extend(rows)
+                        continue
+                    section = options['section'] or path.stem
+                    if section not in SECTIONS:
+                        raise CommandError(f'{path}: pass --section, or name the file after one of {", ".join(SECTIONS)}')
+                    data[section].extend(read_csv(handle, section))
+        except OSError as e:
+            raise CommandError(str(e))
+        except (CatalogueError, ValueError) as e:
+            raise CommandError(f'Could not read the input: {e}')
+
+        started = time.monotonic()
+        try:
+            counts = CatalogueImport(data, update=options['update'], batch_size=options['batch_size']).run(
+                dry_run=options['dry_run'])
+        except CatalogueError as e:
+            for error in e.errors:
+                self.stderr.write(f'  ✗ {error}')
+            raise CommandError('Invalid input; nothing was imported')
+
+        for section, section_counts in counts.items():
+            if any(section_counts.values()):
+                self.stdout.write(
+                    f'  ✓ {section}: {section_counts["created"]} created, '
+                    f'{section_counts["updated"]} updated, {section_counts["skipped"]} skipped'
+                )
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS('✅ Input is valid (dry run, nothing written)'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'✅ Catalogue imported in {time.monotonic() - started:.1f}s'))
@@ -0,0 +1,31 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.newsletter import IMPORT_BATCH_SIZE, import_subscribers
+
+
+class Command(BaseCommand):
+    help = 'Import newsletter subscribers from a CSV file with an "email" column'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file to import, or - for standard input')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Subscribers upserted per statement',
+        )
+        parser.add_argument('--encoding', default='utf-8-sig')
+
+    def handle(self, *args, **options):
+        try:
+            if options['path'] == '-':
+                counts = import_subscribers(sys.stdin, batch_size=options['batch_size'])
+            else:
+                with open(options['path'], encoding=options['encoding'], newline='') as handle:
+                    counts = import_subscribers(handle, batch_size=options['batch_size'])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        self.stdout.write(f'  ✓ {counts["duplicates"]} duplicate and {counts["invalid"]} invalid row(s) skipped')
+        self.stdout.write(self.style.SUCCESS(f'✅ Imported {counts["upserted"]} subscriber(s)'))
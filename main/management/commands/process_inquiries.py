@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from main import intake
+
+
+class Command(BaseCommand):
+    help = 'Store contact form submissions from the intake spool in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the spool is empty instead of polling for new submissions',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=intake.BATCH_SIZE,
+            help='Submissions stored per transaction',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds to wait between polls of an empty spool',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'  ✓ Draining {intake.SPOOL_DIR} ({intake.pending()} pending)')
+        try:
+            created = intake.work(
+                once=options['once'],
+                poll_interval=options['poll_interval'],
+                batch_size=options['batch_size'],
+            )
+        except KeyboardInterrupt:
+            created = None
+        if created is not None:
+            self.stdout.write(f'  ✓ Stored {created} inquiry(ies)')
+        self.stdout.write(self.style.SUCCESS('✅ Intake worker stopped'))
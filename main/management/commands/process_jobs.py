@@ -0,0 +1,96 @@
+import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from main import jobs
+
+
+def _process_worker(stop, work_options):
+    import django
+    django.setup()
+    try:
+        jobs.work(stop=stop, **work_options)
+    except KeyboardInterrupt:
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Run background jobs (image processing) from the database queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=getattr(settings, 'JOBS_WORKERS', 2),
+            help='Number of concurrent workers',
+        )
+        parser.add_argument(
+            '--mode',
+            choices=['thread', 'process'],
+            default='thread',
+            help='Run workers as threads or as separate processes',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the queue is empty instead of polling for new jobs',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds to wait between polls of an empty queue',
+        )
+        parser.add_argument(
+            '--visibility-timeout',
+            type=int,
+            default=jobs.VISIBILITY_TIMEOUT,
+            help='Seconds a claimed job stays leased before another worker may retry it',
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        work_options = {
+            'once': options['once'],
+            'poll_interval': options['poll_interval'],
+            'visibility_timeout': options['visibility_timeout'],
+        }
+        self.stdout.write(f'  ✓ Starting {workers} {options["mode"]} worker(s)')
+        if options['mode'] == 'process':
+            self.run_processes(workers, work_options)
+        else:
+            self.run_threads(workers, work_options)
+        self.stdout.write(self.style.SUCCESS('✅ Job workers stopped'))
+
+    def run_threads(self, workers, work_options):
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(jobs.work, stop=stop, **work_options) for _ in range(workers)]
+            try:
+                processed = sum(future.result() for future in futures)
+            except KeyboardInterrupt:
+                stop.set()
+                processed = sum(future.result() for future in futures)
+        self.stdout.write(f'  ✓ Processed {processed} job(s)')
+
+    def run_processes(self, workers, work_options):
+        # Children must not inherit the parent's database connections.
+        connections.close_all()
+        stop = multiprocessing.Event()
+        children = [
+            multiprocessing.Process(target=_process_worker, args=(stop, work_options), daemon=True)
+            for _ in range(workers)
+        ]
+        for child in children:
+            child.start()
+        try:
+            for child in children:
+                child.join()
+        except KeyboardInterrupt:
+            stop.set()
+            for child in children:
+                child.join()
@@ -0,0 +1,46 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+class PurgeHandler(BaseHTTPRequestHandler):
+    """Accepts the purge requests sent by main.surrogate and logs their keys"""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        try:
+            keys = json.loads(body)['surrogate_keys']
+        except (ValueError, KeyError, TypeError):
+            keys = self.headers.get('Surrogate-Key', '').split()
+        self.server.received.append(keys)
+        self.server.stdout.write(f'PURGE {" ".join(keys)}')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps({'status': 'ok', 'purged': len(keys)}).encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Run a local stand-in for the proxy purge endpoint (set SURROGATE_PURGE_URL to it)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8081)
+
+    def handle(self, *args, **options):
+        server = ThreadingHTTPServer((options['host'], options['port']), PurgeHandler)
+        server.received = []
+        server.stdout = self.stdout
+        self.stdout.write(self.style.SUCCESS(
+            f'Listening for purges on http://{options["host"]}:{server.server_port}/'
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
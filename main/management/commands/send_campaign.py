@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from main import campaigns
+from main.models import Campaign
+
+
+class Command(BaseCommand):
+    help = 'Send (or resume sending) a newsletter campaign'
+
+    def add_arguments(self, parser):
+        parser.add_argument('campaign_id', type=int)
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=campaigns.WORKERS,
+            help='Concurrent senders, each with its own reused mail connection',
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=campaigns.RATE,
+            help='Maximum messages per second across all workers (0 for no limit)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=campaigns.BATCH_SIZE,
+            help='Deliveries claimed and checkpointed together',
+        )
+        parser.add_argument(
+            '--resend-unconfirmed',
+            action='store_true',
+            help='Also retry deliveries an interrupted run may or may not have sent',
+        )
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='Also retry deliveries the mail server rejected, even on a sent campaign',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            campaign = Campaign.objects.get(pk=options['campaign_id'])
+        except Campaign.DoesNotExist:
+            raise CommandError(f'Campaign {options["campaign_id"]} does not exist')
+        if campaign.status == 'sent' and not options['retry_failed']:
+            raise CommandError(f'Campaign "{campaign}" has already been sent')
+
+        self.stdout.write(f'  ✓ Sending "{campaign}"')
+        try:
+            counts = campaigns.send_campaign(
+                campaign,
+                workers=options['workers'],
+                rate=options['rate'],
+                batch_size=options['batch_size'],
+                resend_unconfirmed=options['resend_unconfirmed'],
+                retry_failed=options['retry_failed'],
+            )
+        except campaigns.CampaignSendError as e:
+            self.stdout.write(f'  Sent {e.counts["sent"]}, failed {e.counts["failed"]} before stopping')
+            raise CommandError(f'{e}; rerun with --resend-unconfirmed to finish')
+        remaining = campaign.deliveries.exclude(status__in=['sent', 'failed']).count()
+        if counts['failed']:
+            self.stdout.write(self.style.WARNING(
+                f'  ! {counts["failed"]} message(s) failed; rerun with --retry-failed to retry them'))
+        if remaining:
+            self.stdout.write(self.style.WARNING(
+                f'  ! {remaining} delivery(ies) unconfirmed; rerun with --resend-unconfirmed to retry them'))
+        self.stdout.write(self.style.SUCCESS(f'✅ Sent {counts["sent"]} message(s)'))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from main.rollups import update_rollups
+
+
+class Command(BaseCommand):
+    help = 'Fold complete days since the last run into the daily rollup tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--until',
+            help='Last day to fold in (YYYY-MM-DD); defaults to yesterday',
+        )
+        parser.add_argument(
+            '--reprocess-days',
+            type=int,
+            default=0,
+            help='Also re-fold this many trailing days, e.g. to pick up responded inquiries',
+        )
+
+    def handle(self, *args, **options):
+        until = None
+        if options['until']:
+            until = parse_date(options['until'])
+            if until is None:
+                raise CommandError('--until must be a date in YYYY-MM-DD format')
+
+        processed = update_rollups(until=until, reprocess_days=options['reprocess_days'])
+        for name, days in processed.items():
+            self.stdout.write(f'  ✓ {name}: {days} day{"s" if days != 1 else ""} processed')
+        self.stdout.write(self.style.SUCCESS('✅ Rollups up to date'))
@@ -0,0 +1,42 @@
+from pathlib import Path
+from urllib.request import urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.assets import VENDOR, sha256
+
+STATIC_DIR = Path(__file__).resolve().parents[2] / 'static'
+
+
+class Command(BaseCommand):
+    help = 'Download pinned third-party static assets missing from main/static/vendor'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Download every vendored file again, even if present',
+        )
+
+    def handle(self, *args, **options):
+        fetched = 0
+        for path, (url, digest) in VENDOR.items():
+            target = STATIC_DIR / path
+            if target.exists() and not options['force']:
+                if sha256(target.read_bytes()) != digest:
+                    raise CommandError(f'{path} does not match its pinned sha256')
+                continue
+
+            try:
+                with urlopen(url, timeout=30) as response:
+                    content = response.read()
+            except OSError as e:
+                raise CommandError(f'Could not download {url}: {e}')
+            if sha256(content) != digest:
+                raise CommandError(f'{url} does not match its pinned sha256')
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(content)
+            fetched += 1
+            self.stdout.write(f'  ✓ {path}')
+        self.stdout.write(self.style.SUCCESS(f'✅ Vendored assets up to date ({fetched} downloaded)'))
@@ -0,0 +1,43 @@
+from django.db import DatabaseError, migrations
+
+# Self-contained on purpose: main.search may change, this migration may not.
+TABLE = 'main_search_index'
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+                f"title, summary, body, tokenize='unicode61 remove_diacritics 2')"
+            )
+        except DatabaseError:
+            # SQLite built without FTS5; main.search.is_supported() sees no table.
+            pass
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE TABLE IF NOT EXISTS {TABLE} ("
+            f"id bigint PRIMARY KEY, kind smallint NOT NULL, document tsvector NOT NULL)"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {TABLE}_document ON {TABLE} USING GIN (document)"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0003_companyprofile_companystats_contactinquiry_and_more'),
+    ]
+
+    operations = [
+        # Existing services, projects, news articles and team members are indexed
+        # by "manage.py rebuild_search_index", not here.
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
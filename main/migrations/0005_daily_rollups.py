@@ -0,0 +1,70 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('articles_published', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Content Daily Rollup',
+                'verbose_name_plural': 'Content Daily Rollups',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='NewsletterDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('subscriptions', models.IntegerField(default=0)),
+                ('unsubscriptions', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Newsletter Daily Rollup',
+                'verbose_name_plural': 'Newsletter Daily Rollups',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_date', models.DateField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Rollup Watermark',
+                'verbose_name_plural': 'Rollup Watermarks',
+            },
+        ),
+        migrations.CreateModel(
+            name='InquiryDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('inquiry_type', models.CharField(choices=[('general', 'General Inquiry'), ('quote', 'Request Quote'), ('consultation', 'Consultation Request'), ('partnership', 'Partnership Inquiry'), ('career', 'Career Inquiry'), ('complaint', 'Complaint')], max_length=20)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('urgent', 'Urgent')], max_length=10)),
+                ('is_responded', models.BooleanField(default=False)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Inquiry Daily Rollup',
+                'verbose_name_plural': 'Inquiry Daily Rollups',
+                'ordering': ['-date'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'inquiry_type', 'priority', 'is_responded'), name='unique_inquiry_daily_rollup')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+from collections import defaultdict
+
+from django.db import migrations
+
+
+def normalize_emails(apps, schema_editor):
+    """Lower-case stored addresses, merging rows that differ only in case"""
+    Newsletter = apps.get_model('main', 'Newsletter')
+    groups = defaultdict(list)
+    for subscriber in Newsletter.objects.order_by('subscribed_date', 'pk'):
+        groups[subscriber.email.strip().lower()].append(subscriber)
+
+    for email, (kept, *duplicates) in groups.items():
+        if kept.email == email and not duplicates:
+            continue
+        # Keep the oldest row; it stays subscribed if any variant is
+        if any(subscriber.is_active for subscriber in duplicates) and not kept.is_active:
+            kept.is_active = True
+            kept.unsubscribed_date = None
+        kept.name = kept.name or next((s.name for s in duplicates if s.name), '')
+        Newsletter.objects.filter(pk__in=[subscriber.pk for subscriber in duplicates]).delete()
+        kept.email = email
+        kept.save(update_fields=['email', 'name', 'is_active', 'unsubscribed_date'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_contact_inquiry_content_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_emails, migrations.RunPython.noop),
+    ]
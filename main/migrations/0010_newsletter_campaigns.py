@@ -0,0 +1,56 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0009_normalize_newsletter_emails'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Campaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(default='', max_length=200)),
+                ('subject', models.CharField(default='', help_text='Django template; rendered once per segment', max_length=200)),
+                ('body_text', models.TextField(default='', help_text="Plain-text Django template; {{ segment }} is the subscriber's segment value")),
+                ('body_html', models.TextField(blank=True, default='', help_text='Optional HTML alternative, same context as the text body')),
+                ('audience', models.JSONField(blank=True, default=dict, help_text='Preferences subscribers must have, e.g. {"topics": "construction"}')),
+                ('segment_key', models.CharField(blank=True, default='', help_text='Preference whose value selects the segment, e.g. language', max_length=50)),
+                ('status', models.CharField(choices=[('draft', 'Draft'), ('sending', 'Sending'), ('sent', 'Sent')], default='draft', max_length=10)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Campaign',
+                'verbose_name_plural': 'Campaigns',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CampaignDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.EmailField(max_length=254)),
+                ('segment', models.CharField(blank=True, default='', max_length=100)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('error', models.TextField(blank=True, default='')),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='main.campaign')),
+                ('subscriber', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='main.newsletter')),
+            ],
+            options={
+                'verbose_name': 'Campaign Delivery',
+                'verbose_name_plural': 'Campaign Deliveries',
+                'ordering': ['campaign', 'id'],
+                'indexes': [models.Index(fields=['campaign', 'status', 'id'], name='delivery_queue_idx')],
+                'constraints': [models.UniqueConstraint(fields=('campaign', 'email'), name='delivery_unique_recipient')],
+            },
+        ),
+    ]
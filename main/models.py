@@ -67,7 +67,7 @@ class ServiceCategory(models.Model):
         return self.name
 
     def get_absolute_url(self):
-        return reverse('service_detail', kwargs={'slug': self.slug})
+        return reverse('main:service_detail', kwargs={'slug': self.slug})
 
 
 class Service(models.Model):
@@ -93,12 +93,17 @@ class Service(models.Model):
         verbose_name = "Service"
         verbose_name_plural = "Services"
         ordering = ['order', 'title']
+        indexes = [
+            models.Index(fields=['order', 'title'], condition=models.Q(is_active=True), name='service_active_idx'),
+            models.Index(fields=['order', 'title'], condition=models.Q(is_active=True, is_featured=True), name='service_featured_idx'),
+            models.Index(fields=['category', 'order', 'title'], condition=models.Q(is_active=True), name='service_category_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
     def get_absolute_url(self):
-        return reverse('service_detail', kwargs={'slug': self.slug})
+        return reverse('main:service_detail', kwargs={'slug': self.slug})
 
 
 class TeamMember(models.Model):
@@ -136,6 +141,10 @@ class TeamMember(models.Model):
         verbose_name = "Team Member"
         verbose_name_plural = "Team Members"
         ordering = ['order', 'name']
+        indexes = [
+            models.Index(fields=['order', 'name'], condition=models.Q(is_active=True), name='team_active_idx'),
+            models.Index(fields=['order', 'name'], condition=models.Q(is_active=True, is_featured=True), name='team_featured_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.position}"
@@ -172,6 +181,9 @@ class Partner(models.Model):
         verbose_name = "Partner"
         verbose_name_plural = "Partners"
         ordering = ['order', 'name']
+        indexes = [
+            models.Index(fields=['order', 'name'], condition=models.Q(is_active=True), name='partner_active_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -209,16 +221,46 @@ class NewsArticle(models.Model):
         verbose_name = "News Article"
         verbose_name_plural = "News Articles"
         ordering = ['-published_date']
+        indexes = [
+            models.Index(fields=['-published_date', '-id'], condition=models.Q(is_published=True), name='news_published_idx'),
+            models.Index(fields=['article_type', '-published_date', '-id'], condition=models.Q(is_published=True), name='news_type_idx'),
+            models.Index(fields=['-published_date'], condition=models.Q(is_published=True, is_featured=True), name='news_featured_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
     def get_absolute_url(self):
-        return reverse('news_detail', kwargs={'slug': self.slug})
+        return reverse('main:news_detail', kwargs={'slug': self.slug})
 
     def increment_views(self):
+        # Buffered and flushed in batches; see main/view_counter.py
+        from .view_counter import record_view
+        record_view(self.pk)
         self.views_count += 1
-        self.save(update_fields=['views_count'])
+
+
+class ProjectQuerySet(models.QuerySet):
+    """Project queries shared by the public listing pages"""
+
+    # Service badges shown on a project card
+    CARD_SERVICES = 3
+
+    def cards(self):
+        """
+        Projects ready to render as cards: the first CARD_SERVICES services in
+        ``card_services`` and the total in ``services_count``, so a page of
+        cards costs one query plus one prefetch.
+        """
+        return self.annotate(
+            services_count=models.Count('services_provided', distinct=True),
+        ).prefetch_related(
+            models.Prefetch(
+                'services_provided',
+                queryset=Service.objects.only('id', 'title', 'order')[:self.CARD_SERVICES],
+                to_attr='card_services',
+            )
+        )
 
 
 class Project(models.Model):
@@ -258,16 +300,24 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProjectQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Project"
         verbose_name_plural = "Projects"
         ordering = ['-start_date']
+        indexes = [
+            models.Index(fields=['-start_date', '-id'], condition=models.Q(is_public=True), name='project_public_idx'),
+            models.Index(fields=['project_type', 'status', '-start_date', '-id'], condition=models.Q(is_public=True), name='project_type_status_idx'),
+            models.Index(fields=['status', '-start_date', '-id'], condition=models.Q(is_public=True), name='project_status_idx'),
+            models.Index(fields=['-start_date'], condition=models.Q(is_public=True, is_featured=True), name='project_featured_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.client}"
 
     def get_absolute_url(self):
-        return reverse('project_detail', kwargs={'slug': self.slug})
+        return reverse('main:project_detail', kwargs={'slug': self.slug})
 
 
 class ContactInquiry(models.Model):
@@ -303,6 +353,8 @@ class ContactInquiry(models.Model):
     responded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     response_date = models.DateTimeField(null=True, blank=True)
     response_notes = models.TextField(blank=True, default="")
+    # sha256 of the submitted content, used to drop duplicate submissions
+    content_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -310,6 +362,11 @@ class ContactInquiry(models.Model):
         verbose_name = "Contact Inquiry"
         verbose_name_plural = "Contact Inquiries"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_responded', 'priority', '-created_at'], name='inquiry_triage_idx'),
+            models.Index(fields=['-created_at'], name='inquiry_created_idx'),
+            models.Index(fields=['content_hash', 'created_at'], name='inquiry_hash_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.subject}"
@@ -328,10 +385,20 @@ class Newsletter(models.Model):
         verbose_name = "Newsletter Subscription"
         verbose_name_plural = "Newsletter Subscriptions"
         ordering = ['-subscribed_date']
+        indexes = [
+            models.Index(fields=['-subscribed_date'], name='newsletter_subscribed_idx'),
+            models.Index(fields=['unsubscribed_date'], condition=models.Q(unsubscribed_date__isnull=False), name='newsletter_unsubscribed_idx'),
+        ]
 
     def __str__(self):
         return self.email
 
+    def save(self, *args, **kwargs):
+        # Case variants of an address share one row; see main/newsletter.py
+        from .newsletter import normalize_email
+        self.email = normalize_email(self.email)
+        super().save(*args, **kwargs)
+
 
 class Testimonial(models.Model):
     """Model for client testimonials"""
@@ -352,6 +419,9 @@ class Testimonial(models.Model):
         verbose_name = "Testimonial"
         verbose_name_plural = "Testimonials"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], condition=models.Q(is_approved=True, is_featured=True), name='testimonial_featured_idx'),
+        ]
 
     def __str__(self):
         return f"{self.client_name} - {self.rating} stars"
@@ -376,4 +446,163 @@ class SEOSettings(models.Model):
         verbose_name_plural = "SEO Settings"
 
     def __str__(self):
-        return f"SEO - {self.page_name}"
\ No newline at end of file
+        return f"SEO - {self.page_name}"
+
+class InquiryDailyRollup(models.Model):
+    """Daily contact inquiry counts, maintained by the update_rollups command"""
+    date = models.DateField()
+    inquiry_type = models.CharField(max_length=20, choices=ContactInquiry.INQUIRY_TYPES)
+    priority = models.CharField(max_length=10, choices=ContactInquiry.PRIORITY_LEVELS)
+    is_responded = models.BooleanField(default=False)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Inquiry Daily Rollup"
+        verbose_name_plural = "Inquiry Daily Rollups"
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'inquiry_type', 'priority', 'is_responded'],
+                name='unique_inquiry_daily_rollup',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.date} - {self.inquiry_type}/{self.priority}: {self.count}"
+
+
+class NewsletterDailyRollup(models.Model):
+    """Daily newsletter subscription and unsubscription counts"""
+    date = models.DateField(unique=True)
+    subscriptions = models.IntegerField(default=0)
+    unsubscriptions = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Newsletter Daily Rollup"
+        verbose_name_plural = "Newsletter Daily Rollups"
+        ordering = ['-date']
+
+    def __str__(self):
+        return f"{self.date} - +{self.subscriptions}/-{self.unsubscriptions}"
+
+
+class ContentDailyRollup(models.Model):
+    """Daily count of published news articles"""
+    date = models.DateField(unique=True)
+    articles_published = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Content Daily Rollup"
+        verbose_name_plural = "Content Daily Rollups"
+        ordering = ['-date']
+
+    def __str__(self):
+        return f"{self.date} - {self.articles_published} articles"
+
+
+class RollupWatermark(models.Model):
+    """Last complete day folded into a rollup table"""
+    name = models.CharField(max_length=50, unique=True)
+    last_date = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Rollup Watermark"
+        verbose_name_plural = "Rollup Watermarks"
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_date}"
+
+
+class Job(models.Model):
+    """Background job in the database-backed queue (see main/jobs.py)"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    key = models.CharField(max_length=255, unique=True, help_text="Idempotency key; enqueueing an existing key is a no-op")
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=5)
+    available_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='job_ready_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} [{self.status}] {self.key}"
+
+
+class Campaign(models.Model):
+    """Newsletter campaign sent with manage.py send_campaign (see main/campaigns.py)"""
+    STATUS_CHOICES = [
+        ('draft', 'Draft'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+    ]
+
+    name = models.CharField(max_length=200, default="")
+    subject = models.CharField(max_length=200, default="", help_text="Django template; rendered once per segment")
+    body_text = models.TextField(default="", help_text="Plain-text Django template; {{ segment }} is the subscriber's segment value")
+    body_html = models.TextField(blank=True, default="", help_text="Optional HTML alternative, same context as the text body")
+    audience = models.JSONField(default=dict, blank=True, help_text='Preferences subscribers must have, e.g. {"topics": "construction"}')
+    segment_key = models.CharField(max_length=50, blank=True, default="", help_text="Preference whose value selects the segment, e.g. language")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='draft')
+    started_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Campaign"
+        verbose_name_plural = "Campaigns"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return self.name
+
+
+class CampaignDelivery(models.Model):
+    """One recipient of a campaign; its status is the send checkpoint"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    campaign = models.ForeignKey(Campaign, on_delete=models.CASCADE, related_name='deliveries')
+    subscriber = models.ForeignKey(Newsletter, on_delete=models.SET_NULL, null=True, blank=True)
+    email = models.EmailField()
+    segment = models.CharField(max_length=100, blank=True, default="")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    error = models.TextField(blank=True, default="")
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Campaign Delivery"
+        verbose_name_plural = "Campaign Deliveries"
+        ordering = ['campaign', 'id']
+        constraints = [
+            models.UniqueConstraint(fields=['campaign', 'email'], name='delivery_unique_recipient'),
+        ]
+        indexes = [
+            models.Index(fields=['campaign', 'status', 'id'], name='delivery_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.email} [{self.status}]"
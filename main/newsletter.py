@@ -0,0 +1,154 @@
+"""
+Newsletter subscriptions: single-statement upserts, bulk import and export.
+
+subscribe() inserts the address or, if it is already on the list, reactivates
+it, in one ``INSERT ... ON CONFLICT (email) DO UPDATE ... RETURNING`` round
+trip (SQLite 3.35+ and PostgreSQL). Concurrent double submits therefore
+never race on the unique email constraint. Addresses are normalized first so
+that case variants share one row.
+
+import_subscribers() reads CSV rows lazily and upserts them in fixed-size
+bulk_create(update_conflicts=True) batches; export_csv() streams the active
+list. Both keep memory flat apart from the set of addresses already seen.
+"""
+import csv
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from .exports import Echo
+from .models import Newsletter
+
+CREATED = 'created'
+REACTIVATED = 'reactivated'
+ALREADY_SUBSCRIBED = 'already_subscribed'
+
+UPSERT_VENDORS = ('sqlite', 'postgresql')
+
+IMPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_COLUMNS = ('email', 'name', 'subscribed_date', 'preferences')
+
+
+def normalize_email(email):
+    """Canonical form of an address: trimmed and lower-cased"""
+    return (email or '').strip().lower()
+
+
+def _upsert_sql():
+    qn = connection.ops.quote_name
+    table = qn(Newsletter._meta.db_table)
+    columns = ', '.join(qn(name) for name in (
+        'email', 'name', 'is_active', 'subscribed_date', 'unsubscribed_date', 'preferences'))
+    # The WHERE makes an already active row return nothing; a returned row was
+    # inserted if it carries our subscribed_date, and reactivated otherwise.
+    return f"""
+        INSERT INTO {table} ({columns}) VALUES (%s, %s, %s, %s, NULL, %s)
+        ON CONFLICT ({qn('email')}) DO UPDATE SET
+            {qn('is_active')} = excluded.{qn('is_active')},
+            {qn('unsubscribed_date')} = NULL,
+            {qn('name')} = CASE WHEN {table}.{qn('name')} = '' THEN excluded.{qn('name')}
+                           ELSE {table}.{qn('name')} END
+        WHERE NOT {table}.{qn('is_active')}
+        RETURNING {qn('subscribed_date')} = %s
+    """
+
+
+def _prep(name, value):
+    return Newsletter._meta.get_field(name).get_db_prep_save(value, connection)
+
+
+def subscribe(email, name=''):
+    """Add or reactivate email; return CREATED, REACTIVATED or ALREADY_SUBSCRIBED"""
+    email = normalize_email(email)
+    if connection.vendor not in UPSERT_VENDORS:
+        return _subscribe_fallback(email, name)
+
+    now = _prep('subscribed_date', timezone.now())
+    params = [
+        _prep('email', email), _prep('name', name), _prep('is_active', True), now,
+        _prep('preferences', {}), now,
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(_upsert_sql(), params)
+        row = cursor.fetchone()
+    if row is None:
+        return ALREADY_SUBSCRIBED
+    return CREATED if row[0] else REACTIVATED
+
+
+def _subscribe_fallback(email, name):
+    """get_or_create path for backends without ON CONFLICT ... RETURNING"""
+    try:
+        with transaction.atomic():
+            Newsletter.objects.create(email=email, name=name, is_active=True)
+        return CREATED
+    except IntegrityError:
+        pass
+    updated = Newsletter.objects.filter(email=email, is_active=False).update(
+        is_active=True, unsubscribed_date=None)
+    return REACTIVATED if updated else ALREADY_SUBSCRIBED
+
+
+def import_subscribers(lines, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Upsert subscribers from CSV text lines with an ``email`` column and
+    optional ``name`` and ``preferences`` (JSON) columns. New addresses are
+    subscribed; existing rows get the imported columns but keep their
+    subscription status. Return counts of upserted, duplicate and invalid rows.
+    """
+    reader = csv.DictReader(lines)
+    columns = {name.strip().lower() for name in reader.fieldnames or ()}
+    if 'email' not in columns:
+        raise ValueError('The CSV needs an "email" column.')
+    update_fields = [name for name in ('name', 'preferences') if name in columns]
+
+    counts = {'upserted': 0, 'duplicates': 0, 'invalid': 0}
+    seen = set()
+    batch = []
+    for row in reader:
+        row = {(key or '').strip().lower(): (value or '').strip() for key, value in row.items()}
+        email = normalize_email(row.get('email'))
+        try:
+            validate_email(email)
+            preferences = json.loads(row['preferences']) if row.get('preferences') else {}
+        except (ValidationError, ValueError):
+            counts['invalid'] += 1
+            continue
+        if email in seen:
+            counts['duplicates'] += 1
+            continue
+        seen.add(email)
+        batch.append(Newsletter(email=email, name=row.get('name', '')[:100], preferences=preferences))
+        if len(batch) >= batch_size:
+            counts['upserted'] += _upsert_batch(batch, update_fields)
+            batch = []
+    if batch:
+        counts['upserted'] += _upsert_batch(batch, update_fields)
+    return counts
+
+
+def _upsert_batch(batch, update_fields):
+    if update_fields:
+        Newsletter.objects.bulk_create(
+            batch, update_conflicts=True, unique_fields=['email'], update_fields=update_fields)
+    else:
+        Newsletter.objects.bulk_create(batch, ignore_conflicts=True)
+    return len(batch)
+
+
+def export_csv(chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the active subscribers as CSV lines, fetching chunk_size rows at a time"""
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    rows = (
+        Newsletter.objects.filter(is_active=True).order_by('pk')
+        .values_list(*EXPORT_COLUMNS).iterator(chunk_size=chunk_size)
+    )
+    for email, name, subscribed_date, preferences in rows:
+        yield writer.writerow([
+            email, name, subscribed_date.isoformat(), json.dumps(preferences, separators=(',', ':')),
+        ])
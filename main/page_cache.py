@@ -0,0 +1,229 @@
+"""
+In-process full-page cache for anonymous GETs.
+
+PageCacheMiddleware stores the rendered response of every view decorated with
+main.freshness.conditional_page, tagged with the models the decorator lists.
+The key is the path plus the query parameters the view actually reads
+(QUERY_KEYS); anything else in the query string is ignored.
+
+Entries are dropped as soon as a tagged model changes:
+
+* in this process, main.signals purges the tag's entries directly;
+* in every other worker, a hit is only served while the generation counters
+  (main/generations.py) and the site-settings version it was stored with are
+  still current, which costs a shared-cache lookup and no ORM queries.
+
+The store is an LRU bounded by PAGE_CACHE_MAX_ENTRIES and PAGE_CACHE_MAX_BYTES.
+Only requests without a session cookie are served from it, and only responses
+that set no cookies (so no CSRF token or session) are stored.
+"""
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from .generations import get_generations
+from .site_settings import get_site_settings
+
+MAX_ENTRIES = getattr(settings, 'PAGE_CACHE_MAX_ENTRIES', 1000)
+MAX_BYTES = getattr(settings, 'PAGE_CACHE_MAX_BYTES', 32 * 1024 * 1024)
+TIMEOUT = getattr(settings, 'PAGE_CACHE_TIMEOUT', 60 * 10)
+
+# Query parameters that change a page's content, per URL name
+QUERY_KEYS = {
+    'main:services': ('search',),
+    'main:projects': ('type', 'status', 'cursor'),
+    'main:news': ('type', 'cursor'),
+}
+
+# Response headers replayed on a hit
+STORED_HEADERS = (
+    'Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Content-Language',
+    'Surrogate-Control', 'Surrogate-Key',
+)
+
+
+class CachedPage:
+    __slots__ = ('content', 'headers', 'models', 'generations', 'site_version', 'expires')
+
+    def __init__(self, content, headers, models, generations, site_version, expires):
+        self.content = content
+        self.headers = headers
+        self.models = models
+        self.generations = generations
+        self.site_version = site_version
+        self.expires = expires
+
+
+class PageCache:
+    """Thread-safe LRU of CachedPage objects with a model -> keys tag index"""
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._tags = defaultdict(set)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.purges = 0
+
+    def get(self, key):
+        with self._lock:
+            page = self._entries.get(key)
+            if page is not None:
+                self._entries.move_to_end(key)
+            return page
+
+    def set(self, key, page):
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = page
+            self.size += len(page.content)
+            for model in page.models:
+                self._tags[model._meta.label_lower].add(key)
+            while self._entries and (len(self._entries) > self.max_entries or self.size > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def purge_model(self, model):
+        """Drop every page tagged with model; return how many were dropped"""
+        with self._lock:
+            keys = self._tags.pop(model._meta.label_lower, set())
+            for key in keys:
+                self._remove(key)
+            self.purges += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self.size = 0
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'purges': self.purges,
+            }
+
+    def _remove(self, key):
+        page = self._entries.pop(key, None)
+        if page is None:
+            return
+        self.size -= len(page.content)
+        for model in page.models:
+            keys = self._tags.get(model._meta.label_lower)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[model._meta.label_lower]
+
+
+page_cache = PageCache()
+
+
+def _is_anonymous(request):
+    # Decided from cookies alone so that a hit never loads a session.
+    return (
+        settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and 'messages' not in request.COOKIES
+        and 'HTTP_AUTHORIZATION' not in request.META
+    )
+
+
+def page_key(request, url_name):
+    params = tuple(
+        (name, request.GET.get(name, ''))
+        for name in QUERY_KEYS.get(url_name, ())
+        if name in request.GET
+    )
+    return (request.path, params)
+
+
+class PageCacheMiddleware:
+    """Serve and store anonymous GETs of conditional_page views"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        pending = getattr(request, '_page_cache', None)
+        if pending is not None and self.is_cacheable(response):
+            key, models, generations, site_version = pending
+            page_cache.set(key, CachedPage(
+                response.content,
+                {name: response[name] for name in STORED_HEADERS if name in response},
+                models, generations, site_version, time.monotonic() + TIMEOUT,
+            ))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        models = getattr(view_func, 'page_models', None)
+        if models is None or request.method not in ('GET', 'HEAD') or not _is_anonymous(request):
+            return None
+
+        key = page_key(request, request.resolver_match.view_name)
+        generations = get_generations(*models)
+        site_version = get_site_settings().version
+        page = page_cache.get(key)
+        if page is not None and (
+            page.generations != generations
+            or page.site_version != site_version
+            or page.expires < time.monotonic()
+        ):
+            page_cache.delete(key)
+            page = None
+
+        if page is None:
+            page_cache.record(hit=False)
+            if request.method == 'GET':
+                request._page_cache = (key, models, generations, site_version)
+            return None
+
+        page_cache.record(hit=True)
+        if view_func.on_not_rendered is not None:
+            view_func.on_not_rendered(request, *view_args, **view_kwargs)
+        response = HttpResponse(page.content)
+        for name, value in page.headers.items():
+            response[name] = value
+        response['X-Page-Cache'] = 'HIT'
+        return get_conditional_response(
+            request,
+            etag=response.get('ETag'),
+            last_modified=parse_http_date_safe(response.get('Last-Modified', '')),
+            response=response,
+        ) or response
+
+    def is_cacheable(self, response):
+        return (
+            response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and not response.has_header('Set-Cookie')
+        )
@@ -0,0 +1,128 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are addressed by an opaque, signed cursor holding the ordering values
+of the row at the page boundary instead of an OFFSET, and no COUNT(*) is run
+per request, so every page costs the same single query however deep it is.
+"""
+from django.core import signing
+from django.db.models import Q
+
+CURSOR_SALT = 'main.pagination.cursor'
+
+
+class KeysetPage:
+    """One page of a KeysetPaginator; iterable like a Django Page"""
+
+    def __init__(self, object_list, has_next, has_previous, next_cursor, previous_cursor, params, total=None):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.approximate_total = total
+        self._params = params
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def _querystring(self, cursor):
+        params = self._params.copy()
+        params.pop('page', None)
+        params['cursor'] = cursor
+        return params.urlencode()
+
+    @property
+    def next_querystring(self):
+        return self._querystring(self.next_cursor) if self.has_next else ''
+
+    @property
+    def previous_querystring(self):
+        return self._querystring(self.previous_cursor) if self.has_previous else ''
+
+
+class KeysetPaginator:
+    """
+    Paginate queryset on ordering, a sequence of field names (``-`` for
+    descending) whose last entry must be unique, e.g. ('-start_date', '-id').
+    """
+
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.per_page = per_page
+        self.fields = [name.lstrip('-') for name in self.ordering]
+
+    def _encode(self, obj, direction):
+        model = self.queryset.model
+        values = [model._meta.get_field(name).value_to_string(obj) for name in self.fields]
+        return signing.dumps([direction, values], salt=CURSOR_SALT, compress=True)
+
+    def _decode(self, cursor):
+        if not cursor:
+            return None, None
+        try:
+            direction, values = signing.loads(cursor, salt=CURSOR_SALT)
+            model = self.queryset.model
+            values = [model._meta.get_field(name).to_python(value) for name, value in zip(self.fields, values)]
+        except (signing.BadSignature, ValueError, TypeError):
+            return None, None
+        if direction not in ('next', 'prev') or len(values) != len(self.fields):
+            return None, None
+        return direction, values
+
+    def _seek(self, values, reverse):
+        """Q selecting rows strictly after values in (possibly reversed) order"""
+        condition = Q()
+        for i, name in enumerate(self.ordering):
+            field = self.fields[i]
+            descending = name.startswith('-') != reverse
+            step = Q(**{f'{field}__{"lt" if descending else "gt"}': values[i]})
+            for prior, value in zip(self.fields[:i], values[:i]):
+                step &= Q(**{prior: value})
+            condition |= step
+        return condition
+
+    def get_page(self, cursor, params, total=None):
+        """
+        Return the page cursor points at (the first page for a missing or
+        invalid cursor). params is the request's QueryDict, whose other
+        filters are kept in the next/previous links.
+        """
+        direction, values = self._decode(cursor)
+        backwards = direction == 'prev'
+        ordering = self.ordering
+        if backwards:
+            ordering = [name[1:] if name.startswith('-') else f'-{name}' for name in ordering]
+
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, reverse=backwards))
+        rows = list(queryset[:self.per_page + 1])
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if backwards:
+            rows.reverse()
+            has_previous, has_next = more, True
+        else:
+            has_previous, has_next = values is not None, more
+
+        return KeysetPage(
+            rows,
+            has_next=has_next and bool(rows),
+            has_previous=has_previous and bool(rows),
+            next_cursor=self._encode(rows[-1], 'next') if rows else None,
+            previous_cursor=self._encode(rows[0], 'prev') if rows else None,
+            params=params,
+            total=total,
+        )
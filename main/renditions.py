@@ -0,0 +1,268 @@
+"""
+Responsive image renditions.
+
+For every uploaded image in IMAGE_FIELDS, fixed-width JPEG and WebP copies are
+written next to the original (``team/jane.jpg`` -> ``team/jane.w320.jpg``,
+``team/jane.w320.webp``). Widths wider than the original are skipped. The
+widths that exist for a file are remembered in the cache so templates can
+build ``srcset`` attributes without touching storage.
+
+A small square-bounded WebP thumbnail (``team/jane.thumb.webp``) is written
+as well for the admin changelists.
+
+Saving a model only enqueues an ``image.process`` job (see main/jobs.py); the
+worker validates the upload, strips its metadata and writes the renditions.
+"""
+import os
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from . import jobs
+from .invalidation import invalidate_model
+from .models import (
+    CompanyProfile, SEOSettings, TeamMember, Partner, Project, NewsArticle, Testimonial
+)
+
+WIDTHS = tuple(getattr(settings, 'IMAGE_RENDITION_WIDTHS', (160, 320, 640, 960, 1280)))
+JPEG_QUALITY = 82
+# Quality used when an original has to be re-encoded to drop its metadata
+ORIGINAL_JPEG_QUALITY = 95
+WEBP_QUALITY = 80
+
+# Bounding box of admin thumbnails (2x their 50px display size)
+THUMBNAIL_SIZE = getattr(settings, 'ADMIN_THUMBNAIL_SIZE', 100)
+
+# (PIL format, extension) of each rendition; the last one is the <img> fallback
+FORMATS = (('WEBP', 'webp'), ('JPEG', 'jpg'))
+
+# Image fields that get renditions
+IMAGE_FIELDS = {
+    TeamMember: ('profile_image',),
+    Partner: ('logo',),
+    Project: ('featured_image',),
+    NewsArticle: ('featured_image',),
+    Testimonial: ('client_photo',),
+    CompanyProfile: ('logo',),
+    SEOSettings: ('og_image',),
+}
+
+MANIFEST_KEY = 'renditions:{}'
+THUMBNAIL_KEY = 'thumbnail:{}'
+
+ORIENTATION_TAG = 0x0112
+
+
+def rendition_name(name, width, extension):
+    root, _ = os.path.splitext(name)
+    return f'{root}.w{width}.{extension}'
+
+
+def _oriented_width(image):
+    """Display width of image, honouring a 90-degree EXIF orientation"""
+    if image.getexif().get(ORIENTATION_TAG) in (5, 6, 7, 8):
+        return image.height
+    return image.width
+
+
+def _widths_for(original_width):
+    widths = [width for width in WIDTHS if width < original_width]
+    # Always offer at least one re-encoded copy, capped at the original size.
+    return widths or [original_width]
+
+
+def _encode(image, pil_format):
+    buffer = BytesIO()
+    if pil_format == 'JPEG':
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        elif image.mode != 'RGB':
+            image = image.convert('RGB')
+        image.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    else:
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        image.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=4)
+    return buffer.getvalue()
+
+
+def generate_renditions(fieldfile):
+    """Write every rendition of fieldfile; return the widths generated"""
+    storage = fieldfile.storage
+    with storage.open(fieldfile.name, 'rb') as handle:
+        image = Image.open(handle)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    widths = _widths_for(image.width)
+    for width in widths:
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        for pil_format, extension in FORMATS:
+            name = rendition_name(fieldfile.name, width, extension)
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(_encode(resized, pil_format)))
+
+    cache.set(MANIFEST_KEY.format(fieldfile.name), widths, None)
+    return widths
+
+
+def available_widths(fieldfile):
+    """Widths with renditions in storage for fieldfile, smallest first"""
+    key = MANIFEST_KEY.format(fieldfile.name)
+    widths = cache.get(key)
+    if widths is None:
+        storage = fieldfile.storage
+        try:
+            with storage.open(fieldfile.name, 'rb') as handle:
+                # Only the header is read to learn the dimensions.
+                original_width = _oriented_width(Image.open(handle))
+        except (OSError, ValueError):
+            widths = []
+        else:
+            _, extension = FORMATS[-1]
+            widths = _widths_for(original_width)
+            if not all(storage.exists(rendition_name(fieldfile.name, width, extension)) for width in widths):
+                widths = []
+        cache.set(key, widths, None)
+    return widths
+
+
+def ensure_renditions(fieldfile):
+    """Generate renditions for fieldfile unless they already exist"""
+    if fieldfile and not available_widths(fieldfile):
+        return generate_renditions(fieldfile)
+    return []
+
+
+def thumbnail_name(name):
+    root, _ = os.path.splitext(name)
+    return f'{root}.thumb.webp'
+
+
+def generate_thumbnail(fieldfile):
+    """Write the admin thumbnail of fieldfile and return its name"""
+    storage = fieldfile.storage
+    with storage.open(fieldfile.name, 'rb') as handle:
+        image = Image.open(handle)
+        image.draft('RGB', (THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.Resampling.LANCZOS)
+
+    name = thumbnail_name(fieldfile.name)
+    if storage.exists(name):
+        storage.delete(name)
+    storage.save(name, ContentFile(_encode(image, 'WEBP')))
+    cache.set(THUMBNAIL_KEY.format(fieldfile.name), True, None)
+    return name
+
+
+def thumbnail_url(fieldfile):
+    """URL of the stored thumbnail of fieldfile, or None if there is none yet"""
+    key = THUMBNAIL_KEY.format(fieldfile.name)
+    exists = cache.get(key)
+    if exists is None:
+        exists = fieldfile.storage.exists(thumbnail_name(fieldfile.name))
+        # Only a hit is permanent; a missing thumbnail is re-checked shortly.
+        cache.set(key, exists, None if exists else 60)
+    return fieldfile.storage.url(thumbnail_name(fieldfile.name)) if exists else None
+
+
+def ensure_thumbnail(fieldfile):
+    """Generate the thumbnail of fieldfile unless it already exists"""
+    if fieldfile and not thumbnail_url(fieldfile):
+        return generate_thumbnail(fieldfile)
+    return None
+
+
+def srcsets(fieldfile):
+    """Return ``{extension: srcset}`` for fieldfile, empty without renditions"""
+    widths = available_widths(fieldfile)
+    if not widths:
+        return {}
+    storage = fieldfile.storage
+    return {
+        extension: ', '.join(
+            f'{storage.url(rendition_name(fieldfile.name, width, extension))} {width}w'
+            for width in widths
+        )
+        for _, extension in FORMATS
+    }
+
+
+def validate_image(fieldfile):
+    """Raise FatalJobError unless fieldfile is an image Pillow can decode"""
+    try:
+        with fieldfile.storage.open(fieldfile.name, 'rb') as handle:
+            Image.open(handle).verify()
+    except (UnidentifiedImageError, SyntaxError, ValueError) as e:
+        raise jobs.FatalJobError(f'{fieldfile.name} is not a valid image: {e}')
+
+
+def strip_metadata(fieldfile):
+    """
+    Rewrite the original without EXIF/XMP metadata (camera details, GPS),
+    applying its orientation first. Return True if the file was rewritten.
+    """
+    storage = fieldfile.storage
+    with storage.open(fieldfile.name, 'rb') as handle:
+        image = Image.open(handle)
+        if not image.getexif() and not {'xmp', 'XML:com.adobe.xmp', 'comment'} & image.info.keys():
+            return False
+        pil_format = image.format
+        icc_profile = image.info.get('icc_profile')
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    # Encoders fall back to image.info for some metadata; keep only colour.
+    image.info = {}
+
+    buffer = BytesIO()
+    options = {'icc_profile': icc_profile} if icc_profile else {}
+    if pil_format == 'JPEG':
+        options['quality'] = ORIGINAL_JPEG_QUALITY
+    image.save(buffer, pil_format, **options)
+    storage.delete(fieldfile.name)
+    storage.save(fieldfile.name, ContentFile(buffer.getvalue()))
+    return True
+
+
+def enqueue_renditions(instance, field_name):
+    """Queue processing of the file currently in instance.field_name"""
+    fieldfile = getattr(instance, field_name)
+    if not fieldfile:
+        return None
+    label = instance._meta.label_lower
+    job, _ = jobs.enqueue('image.process', {
+        'model': label,
+        'pk': instance.pk,
+        'field': field_name,
+        'name': fieldfile.name,
+    }, key=f'image:{label}:{instance.pk}:{field_name}:{fieldfile.name}')
+    return job
+
+
+@jobs.handler('image.process')
+def process_image(payload):
+    """Validate, strip and render one uploaded image"""
+    model = apps.get_model(payload['model'])
+    instance = model.objects.filter(pk=payload['pk']).first()
+    if instance is None:
+        return
+    fieldfile = getattr(instance, payload['field'])
+    if fieldfile.name != payload['name']:
+        # Replaced since it was queued; the new file has its own job.
+        return
+    validate_image(fieldfile)
+    strip_metadata(fieldfile)
+    generate_renditions(fieldfile)
+    generate_thumbnail(fieldfile)
+    # Pages built from this model can now offer the renditions.
+    invalidate_model(model, instance.pk)
@@ -0,0 +1,202 @@
+"""
+Daily rollup tables behind the dashboard's trend numbers.
+
+``manage.py update_rollups`` folds each complete day since a rollup's
+watermark into its table, so the raw ContactInquiry, Newsletter and
+NewsArticle rows are only scanned once. Readers combine the stored days with
+a live aggregate over the days after the watermark (normally just today),
+which keeps answers exact whether or not the command has run recently and
+makes reading any range O(days) rather than O(rows).
+"""
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import (
+    ContactInquiry, Newsletter, NewsArticle, InquiryDailyRollup,
+    NewsletterDailyRollup, ContentDailyRollup, RollupWatermark
+)
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def _day_range(field, start, end):
+    """Filter kwargs selecting field values on days start..end inclusive"""
+    return {
+        f'{field}__gte': _start_of_day(start),
+        f'{field}__lt': _start_of_day(end + timedelta(days=1)),
+    }
+
+
+def _per_day(queryset, field):
+    return queryset.annotate(date=TruncDate(field)).order_by()
+
+
+class InquiryRollup:
+    """Inquiries per day by type, priority and responded state"""
+    name = 'inquiries'
+    model = InquiryDailyRollup
+    totals = ('inquiries',)
+
+    def first_date(self):
+        first = ContactInquiry.objects.aggregate(first=Min('created_at'))['first']
+        return timezone.localdate(first) if first else None
+
+    def collect(self, start, end):
+        rows = _per_day(
+            ContactInquiry.objects.filter(**_day_range('created_at', start, end)), 'created_at'
+        ).values('date', 'inquiry_type', 'priority', 'is_responded').annotate(count=Count('id'))
+        return [InquiryDailyRollup(**row) for row in rows]
+
+    def stored_totals(self, start, end):
+        rows = self.model.objects.filter(date__range=(start, end)).values('date').annotate(
+            inquiries=Sum('count')
+        ).order_by()
+        return {row['date']: {'inquiries': row['inquiries']} for row in rows}
+
+    def live_totals(self, start, end):
+        totals = defaultdict(Counter)
+        for row in self.collect(start, end):
+            totals[row.date]['inquiries'] += row.count
+        return totals
+
+
+class NewsletterRollup:
+    """Newsletter subscriptions and unsubscriptions per day"""
+    name = 'newsletter'
+    model = NewsletterDailyRollup
+    totals = ('subscriptions', 'unsubscriptions')
+
+    def first_date(self):
+        first = Newsletter.objects.aggregate(first=Min('subscribed_date'))['first']
+        return timezone.localdate(first) if first else None
+
+    def collect(self, start, end):
+        days = defaultdict(Counter)
+        subscribed = _per_day(
+            Newsletter.objects.filter(**_day_range('subscribed_date', start, end)), 'subscribed_date'
+        ).values('date').annotate(count=Count('id'))
+        for row in subscribed:
+            days[row['date']]['subscriptions'] = row['count']
+        unsubscribed = _per_day(
+            Newsletter.objects.filter(**_day_range('unsubscribed_date', start, end)), 'unsubscribed_date'
+        ).values('date').annotate(count=Count('id'))
+        for row in unsubscribed:
+            days[row['date']]['unsubscriptions'] = row['count']
+        return [NewsletterDailyRollup(date=day, **counts) for day, counts in days.items()]
+
+    def stored_totals(self, start, end):
+        rows = self.model.objects.filter(date__range=(start, end)).values(
+            'date', 'subscriptions', 'unsubscriptions'
+        )
+        return {row.pop('date'): row for row in rows}
+
+    def live_totals(self, start, end):
+        return {
+            row.date: {'subscriptions': row.subscriptions, 'unsubscriptions': row.unsubscriptions}
+            for row in self.collect(start, end)
+        }
+
+
+class ContentRollup:
+    """Published news articles per day"""
+    name = 'content'
+    model = ContentDailyRollup
+    totals = ('articles_published',)
+
+    def first_date(self):
+        first = NewsArticle.objects.filter(is_published=True).aggregate(first=Min('published_date'))['first']
+        return timezone.localdate(first) if first else None
+
+    def collect(self, start, end):
+        rows = _per_day(
+            NewsArticle.objects.filter(is_published=True, **_day_range('published_date', start, end)),
+            'published_date',
+        ).values('date').annotate(count=Count('id'))
+        return [ContentDailyRollup(date=row['date'], articles_published=row['count']) for row in rows]
+
+    def stored_totals(self, start, end):
+        rows = self.model.objects.filter(date__range=(start, end)).values('date', 'articles_published')
+        return {row.pop('date'): row for row in rows}
+
+    def live_totals(self, start, end):
+        return {row.date: {'articles_published': row.articles_published} for row in self.collect(start, end)}
+
+
+ROLLUPS = {rollup.name: rollup for rollup in (InquiryRollup(), NewsletterRollup(), ContentRollup())}
+
+
+def get_watermarks():
+    return dict(RollupWatermark.objects.values_list('name', 'last_date'))
+
+
+def rewind_watermark(name, day):
+    """Make rollup name fold day and every later day again, e.g. after rows were dated into the past"""
+    RollupWatermark.objects.filter(name=name, last_date__gte=day).update(last_date=day - timedelta(days=1))
+
+
+def update_rollups(until=None, reprocess_days=0):
+    """
+    Fold every complete day after each watermark, up to until (default
+    yesterday), into the rollup tables. reprocess_days re-folds that many
+    trailing days, e.g. to pick up inquiries responded to since. Return the
+    number of days processed per rollup.
+    """
+    until = until or timezone.localdate() - timedelta(days=1)
+    watermarks = get_watermarks()
+    processed = {}
+    for name, rollup in ROLLUPS.items():
+        last = watermarks.get(name)
+        if last is not None:
+            start = last + timedelta(days=1)
+        else:
+            # First run: start at the oldest row, but always set a watermark.
+            start = min(rollup.first_date() or until, until)
+        if reprocess_days:
+            start = min(start, until - timedelta(days=reprocess_days - 1))
+        if start > until:
+            processed[name] = 0
+            continue
+        with transaction.atomic():
+            rows = rollup.collect(start, until)
+            rollup.model.objects.filter(date__range=(start, until)).delete()
+            rollup.model.objects.bulk_create(rows, batch_size=500)
+            RollupWatermark.objects.update_or_create(name=name, defaults={'last_date': until})
+        processed[name] = (until - start).days + 1
+    return processed
+
+
+def daily_trends(start, end, watermarks=None):
+    """
+    Per-day totals for start..end inclusive: inquiries, subscriptions,
+    unsubscriptions and articles_published.
+    """
+    if watermarks is None:
+        watermarks = get_watermarks()
+    days = {}
+    day = start
+    while day <= end:
+        days[day] = {'date': day}
+        for rollup in ROLLUPS.values():
+            days[day].update(dict.fromkeys(rollup.totals, 0))
+        day += timedelta(days=1)
+
+    for name, rollup in ROLLUPS.items():
+        last = watermarks.get(name)
+        live_start = start
+        if last is not None and last >= start:
+            for day, totals in rollup.stored_totals(start, min(last, end)).items():
+                days[day].update(totals)
+            live_start = last + timedelta(days=1)
+        if live_start <= end:
+            for day, totals in rollup.live_totals(live_start, end).items():
+                days[day].update(totals)
+
+    return list(days.values())
+
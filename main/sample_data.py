@@ -0,0 +1,375 @@
+"""
+Production-sized sample data for load testing (``create_sample_data --scale``).
+
+Each unit of scale adds VOLUMES rows: ``--scale 100`` gives 100k inquiries,
+500k newsletter subscribers, 20k projects with their service and team links
+and 10k news articles, on top of the curated sample content.
+
+Work is split into chunks of ``batch_size`` rows. Every chunk owns a
+contiguous range of primary keys, taken above the current maximum before
+anything is written, and draws from its own random.Random seeded with
+``seed:section:chunk``. The rows are therefore the same for the same seed and
+starting database whether one process writes them or several: with
+``workers > 1`` chunks are shared between forked worker processes, each
+writing its disjoint ID ranges in one transaction per chunk.
+
+Rows are written raw, as loaddata does, so created_at and similar automatic
+dates keep the spread the generator gives them and no save signals fire.
+Each chunk indexes its own rows for search; sequences, caches, proxy keys and
+the rollup watermarks are refreshed once at the end. Dates are relative to midnight UTC of the day
+of the run. clear() empties the same tables just as quickly for ``--reset``.
+"""
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import SET_NULL, Max, Min
+from django.utils import timezone
+from django.utils.text import slugify
+
+from . import search
+from .intake import content_hash
+from .invalidation import invalidate_model
+from .models import ContactInquiry, NewsArticle, Newsletter, Project, Service, TeamMember
+from .rollups import ROLLUPS, ContentRollup, InquiryRollup, NewsletterRollup, rewind_watermark
+
+BATCH_SIZE = 1000
+
+# Rows per unit of --scale
+VOLUMES = {
+    'inquiries': 1000,
+    'subscribers': 5000,
+    'projects': 200,
+    'articles': 100,
+}
+
+# How far back before the run each section's dates reach
+HISTORY_DAYS = {
+    'inquiries': 730,
+    'subscribers': 1095,
+    'projects': 2190,
+    'articles': 1825,
+}
+
+# Section -> the daily rollup its rows are counted in (main/rollups.py)
+SECTION_ROLLUPS = {
+    'inquiries': InquiryRollup.name,
+    'subscribers': NewsletterRollup.name,
+    'articles': ContentRollup.name,
+}
+
+FIRST_NAMES = (
+    'Jean', 'Marie', 'Eric', 'Alice', 'Patrick', 'Grace', 'Emmanuel', 'Diane', 'Claude', 'Aline',
+    'Olivier', 'Josiane', 'Samuel', 'Chantal', 'David', 'Esther', 'Innocent', 'Solange', 'Paul', 'Yvonne',
+)
+LAST_NAMES = (
+    'Uwimana', 'Habimana', 'Mukamana', 'Niyonzima', 'Nkurunziza', 'Uwase', 'Mugisha', 'Ingabire',
+    'Hakizimana', 'Mutesi', 'Nshimiyimana', 'Umutoni', 'Bizimana', 'Iradukunda', 'Gasana', 'Kamanzi',
+)
+COMPANIES = (
+    'Kigali Builders Ltd', 'Rwanda Housing Cooperative', 'Great Lakes Logistics', 'Akagera Agro Ltd',
+    'Virunga Developers', 'Nyungwe Hospitality Group', 'Isange Estates', 'Muhazi Water Company',
+)
+DISTRICTS = (
+    'Gasabo', 'Kicukiro', 'Nyarugenge', 'Musanze', 'Huye', 'Rubavu', 'Rwamagana', 'Muhanga',
+    'Nyagatare', 'Rusizi', 'Karongi', 'Bugesera',
+)
+CLIENTS = (
+    'Ministry of Infrastructure', 'Rwanda Development Board', 'City of Kigali', 'WASAC Ltd',
+    'Rwanda Transport Development Agency', 'University of Rwanda', 'Rwanda Housing Authority',
+    'Private Developer',
+)
+STRUCTURES = (
+    'Office Block', 'Road Rehabilitation', 'Water Supply Network', 'Health Centre', 'Secondary School',
+    'Bridge', 'Market Hall', 'Apartment Complex', 'Drainage System', 'Warehouse', 'Hotel', 'Stadium',
+)
+TOPICS = (
+    'structural design', 'site supervision', 'environmental impact assessment', 'road design',
+    'water supply', 'feasibility study', 'cost estimation', 'geotechnical survey', 'project management',
+)
+SENTENCES = (
+    'The works cover design, tendering and supervision through to handover.',
+    'Sustainable materials and local labour are used wherever possible.',
+    'Surveys were carried out before the detailed design began.',
+    'The team coordinated closely with the district engineers and the community.',
+    'Drainage, access roads and utilities are part of the scope.',
+    'The schedule allows for both rainy seasons of the year.',
+    'Quality checks are made at every stage of construction.',
+    'The budget includes contingencies for ground conditions.',
+    'Designs follow the Rwanda building code and international standards.',
+    'Progress is reported to the client every month.',
+)
+BUDGETS = ('', 'under-10k', '10k-50k', '50k-100k', '100k-500k', 'over-500k')
+TIMELINES = ('', 'asap', '1-3-months', '3-6-months', '6-12-months', 'over-1-year')
+LANGUAGES = ('en', 'en', 'en', 'fr', 'rw')
+INTERESTS = ('infrastructure', 'buildings', 'water', 'environment', 'careers')
+
+
+def _choice(rng, choices):
+    return rng.choice([value for value, _ in choices])
+
+
+def _paragraph(rng, sentences=4):
+    return ' '.join(rng.sample(SENTENCES, sentences))
+
+
+def _person(rng):
+    return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+
+def _moment(rng, context, days):
+    """A time within the last days before the anchor"""
+    return context['anchor'] - timedelta(seconds=rng.randrange(days * 86400))
+
+
+def _inquiries(rng, pks, context):
+    Through = ContactInquiry.services_interested.through
+    objs, links = [], []
+    for pk in pks:
+        first, last = _person(rng)
+        created = _moment(rng, context, HISTORY_DAYS['inquiries'])
+        services = sorted(rng.sample(context['services'], min(rng.randint(0, 3), len(context['services']))))
+        inquiry = ContactInquiry(
+            pk=pk,
+            inquiry_type=_choice(rng, ContactInquiry.INQUIRY_TYPES),
+            priority=_choice(rng, ContactInquiry.PRIORITY_LEVELS),
+            name=f'{first} {last}',
+            email=f'{first}.{last}.{pk}@example.com'.lower(),
+            phone=f'+250 78{rng.randint(0, 9)} {rng.randint(100, 999)} {rng.randint(100, 999)}',
+            company=rng.choice(COMPANIES) if rng.random() < 0.6 else '',
+            subject=f'{rng.choice(TOPICS).capitalize()} for a {rng.choice(STRUCTURES).lower()} in {rng.choice(DISTRICTS)}',
+            message=_paragraph(rng, rng.randint(2, 5)),
+            project_budget=rng.choice(BUDGETS),
+            project_timeline=rng.choice(TIMELINES),
+            created_at=created,
+            updated_at=created,
+        )
+        # Older inquiries are more likely to have been answered
+        if rng.random() < min(0.95, (context['anchor'] - created).days / 60):
+            inquiry.is_responded = True
+            inquiry.response_date = created + timedelta(hours=rng.randint(1, 96))
+            inquiry.updated_at = inquiry.response_date
+        inquiry.content_hash = content_hash({
+            'email': inquiry.email, 'inquiry_type': inquiry.inquiry_type, 'subject': inquiry.subject,
+            'message': inquiry.message, 'services': services,
+        })
+        objs.append(inquiry)
+        links.extend(Through(contactinquiry_id=pk, service_id=service) for service in services)
+    return objs, links
+
+
+def _subscribers(rng, pks, context):
+    objs = []
+    for pk in pks:
+        first, last = _person(rng)
+        subscribed = _moment(rng, context, HISTORY_DAYS['subscribers'])
+        active = rng.random() < 0.9
+        objs.append(Newsletter(
+            pk=pk,
+            email=f'{first}.{last}{pk}@example.org'.lower(),
+            name=f'{first} {last}' if rng.random() < 0.7 else '',
+            is_active=active,
+            subscribed_date=subscribed,
+            unsubscribed_date=None if active else subscribed + timedelta(days=rng.randint(1, 365)),
+            preferences={
+                'language': rng.choice(LANGUAGES),
+                'interests': rng.sample(INTERESTS, rng.randint(0, 3)),
+            },
+        ))
+    return objs, []
+
+
+def _projects(rng, pks, context):
+    ServiceThrough = Project.services_provided.through
+    TeamThrough = Project.team_members.through
+    today = context['anchor'].date()
+    objs, links = [], []
+    for pk in pks:
+        name = f'{rng.choice(DISTRICTS)} {rng.choice(STRUCTURES)}'
+        status = _choice(rng, Project.PROJECT_STATUS)
+        start = today - timedelta(days=rng.randint(0, HISTORY_DAYS['projects']))
+        created = datetime.combine(start, time(), tzinfo=context['anchor'].tzinfo)
+        objs.append(Project(
+            pk=pk,
+            name=name,
+            slug=f'{slugify(name)}-{pk}',
+            client=rng.choice(CLIENTS),
+            project_type=_choice(rng, Project.PROJECT_TYPES),
+            status=status,
+            description=_paragraph(rng, rng.randint(3, 6)),
+            location=f'{rng.choice(DISTRICTS)} District',
+            start_date=start,
+            end_date=start + timedelta(days=rng.randint(90, 900)) if status in ('completed', 'maintenance') else None,
+            budget=Decimal(rng.randrange(50_000, 50_000_000, 1000)),
+            is_featured=rng.random() < 0.02,
+            is_public=rng.random() < 0.95,
+            created_at=created,
+            updated_at=created,
+        ))
+        services = rng.sample(context['services'], min(rng.randint(1, 4), len(context['services'])))
+        team = rng.sample(context['team_members'], min(rng.randint(2, 6), len(context['team_members'])))
+        links.extend(ServiceThrough(project_id=pk, service_id=service) for service in services)
+        links.extend(TeamThrough(project_id=pk, teammember_id=member) for member in team)
+    return objs, links
+
+
+def _articles(rng, pks, context):
+    objs = []
+    for pk in pks:
+        title = f'{rng.choice(TOPICS).capitalize()} on the {rng.choice(DISTRICTS)} {rng.choice(STRUCTURES).lower()}'
+        published = _moment(rng, context, HISTORY_DAYS['articles'])
+        objs.append(NewsArticle(
+            pk=pk,
+            title=title,
+            slug=f'{slugify(title)}-{pk}',
+            article_type=_choice(rng, NewsArticle.ARTICLE_TYPES),
+            excerpt=_paragraph(rng, 2),
+            content='\n\n'.join(_paragraph(rng, rng.randint(3, 6)) for _ in range(rng.randint(4, 10))),
+            author_id=context['author'],
+            is_featured=rng.random() < 0.02,
+            is_published=rng.random() < 0.95,
+            published_date=published,
+            views_count=rng.randint(0, 5000),
+            created_at=published,
+            updated_at=published,
+        ))
+    return objs, []
+
+
+# Section -> (model, row builder)
+SECTIONS = {
+    'inquiries': (ContactInquiry, _inquiries),
+    'subscribers': (Newsletter, _subscribers),
+    'projects': (Project, _projects),
+    'articles': (NewsArticle, _articles),
+}
+
+
+def _insert_raw(objs):
+    """Insert objs with their primary keys and dates as given, without save signals"""
+    if not objs:
+        return
+    model = type(objs[0])
+    fields = model._meta.local_concrete_fields
+    batch_size = connection.ops.bulk_batch_size(fields, objs)
+    for start in range(0, len(objs), batch_size):
+        # raw=True skips pre_save(), which would reset auto_now(_add) dates
+        model._base_manager._insert(objs[start:start + batch_size], fields=fields, raw=True)
+
+
+def _write_chunk(task):
+    section, chunk, start, count, seed, context = task
+    model, build = SECTIONS[section]
+    rng = random.Random(f'{seed}:{section}:{chunk}')
+    objs, links = build(rng, range(start, start + count), context)
+    with transaction.atomic():
+        _insert_raw(objs)
+        # Through rows have no dates to keep; a plain bulk_create will do
+        for through in dict.fromkeys(type(link) for link in links):
+            through.objects.bulk_create([link for link in links if type(link) is through])
+        search.reindex_queryset(model.objects.filter(pk__range=(start, start + count - 1)))
+    return section, count
+
+
+def _work(task):
+    try:
+        return _write_chunk(task)
+    finally:
+        connections.close_all()
+
+
+def plan(scale, seed, batch_size=BATCH_SIZE):
+    """Return the chunk tasks for scale, with primary keys above the current maximum"""
+    anchor = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    context = {
+        'anchor': anchor,
+        'services': list(Service.objects.order_by('pk').values_list('pk', flat=True)),
+        'team_members': list(TeamMember.objects.order_by('pk').values_list('pk', flat=True)),
+        'author': User.objects.filter(is_staff=True).order_by('pk').values_list('pk', flat=True).first(),
+    }
+    tasks = []
+    for section, (model, _) in SECTIONS.items():
+        first = (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+        total = VOLUMES[section] * scale
+        for chunk, offset in enumerate(range(0, total, batch_size)):
+            tasks.append((section, chunk, first + offset, min(batch_size, total - offset), seed, context))
+    return tasks
+
+
+def generate(scale, seed, workers=1, batch_size=BATCH_SIZE):
+    """Write scale units of sample data; return {section: rows written}"""
+    tasks = plan(scale, seed, batch_size)
+    counts = dict.fromkeys(SECTIONS, 0)
+    if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        # Children must open their own database connections
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            for section, count in pool.map(_work, tasks):
+                counts[section] += count
+    else:
+        for task in tasks:
+            section, count = _write_chunk(task)
+            counts[section] += count
+    anchor = tasks[0][5]['anchor'] if tasks else timezone.now()
+    refresh({
+        name: timezone.localdate(anchor - timedelta(days=HISTORY_DAYS[section]))
+        for section, name in SECTION_ROLLUPS.items()
+    })
+    return counts
+
+
+def clear():
+    """Delete every row of the SECTIONS models without per-row signals; return {model: rows deleted}"""
+    counts = {}
+    # Every stored rollup day may have counted rows about to go
+    since = {
+        name: ROLLUPS[name].model.objects.aggregate(first=Min('date'))['first']
+        for name in SECTION_ROLLUPS.values()
+    }
+    # Proxies may hold the detail page of any of them
+    pks = {model: list(model.objects.values_list('pk', flat=True)) for model in (Project, NewsArticle)}
+    with transaction.atomic():
+        for model, _ in SECTIONS.values():
+            relations = model._meta.related_objects
+            if any(relation.many_to_many or relation.on_delete is not SET_NULL for relation in relations):
+                # Cascades need the collector
+                counts[model] = model.objects.all().delete()[1].get(model._meta.label, 0)
+                continue
+            for field in model._meta.many_to_many:
+                field.remote_field.through.objects.all().delete()
+            for relation in relations:
+                relation.related_model._base_manager.exclude(
+                    **{f'{relation.field.name}__isnull': True}).update(**{relation.field.name: None})
+            counts[model] = model.objects.count()
+            with connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM {connection.ops.quote_name(model._meta.db_table)}')
+    refresh(since, pks)
+    search.rebuild()
+    return counts
+
+
+def refresh(since, pks=None):
+    """
+    Catch up after raw writes: reset the primary key sequences, rewind the
+    rollup watermarks and invalidate cached project and news pages.
+
+    ``since``: maps rollup names to the earliest day with added or deleted
+    rows; update_rollups folds that day and every later one again.
+    ``pks``: maps models to the primary keys whose proxy keys are purged.
+    """
+    pks = pks or {}
+    models = [model for model, _ in SECTIONS.values()]
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
+    for name, day in since.items():
+        if day is not None:
+            rewind_watermark(name, day)
+    for model in (Project, NewsArticle):
+        invalidate_model(model, *pks.get(model, ()))
@@ -0,0 +1,333 @@
+"""
+Full-text search index.
+
+Indexed objects live in a single table, ``main_search_index``: an FTS5 virtual
+table on SQLite and a tsvector table with a GIN index on PostgreSQL. Each row
+holds three weighted columns (title, summary, body) and its rowid encodes the
+object's kind and primary key, so updating or removing one object is a point
+lookup. Rows are kept in sync by the receivers in main.signals and can be
+rebuilt with ``manage.py rebuild_search_index``. Without the table (other
+databases, or SQLite built without FTS5) indexing is skipped, service search
+falls back to icontains filtering and site search finds nothing.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, When
+from django.urls import reverse
+
+from .models import Service, Project, NewsArticle, TeamMember
+
+TABLE = 'main_search_index'
+
+# Upper bound on ranked hits fetched per query, which keeps latency flat as
+# the catalogue grows.
+MAX_RESULTS = getattr(settings, 'SEARCH_MAX_RESULTS', 100)
+
+# Cap on candidates considered by the site-wide /search/ page, bounding its
+# latency; facet counts are taken over this ranked set.
+SITE_MAX_RESULTS = getattr(settings, 'SITE_SEARCH_MAX_RESULTS', 500)
+
+# Relative weights of the title, summary and body columns
+WEIGHTS = (10.0, 4.0, 1.0)
+
+# rowid = pk * KIND_SLOTS + kind code
+KIND_SLOTS = 16
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class ServiceDocument:
+    """Search document for an active Service"""
+    kind = 'service'
+    label = 'Services'
+    code = 1
+    model = Service
+
+    def get_queryset(self):
+        return Service.objects.filter(is_active=True).select_related('category')
+
+    def is_indexed(self, obj):
+        return obj.is_active
+
+    def result(self, obj):
+        return obj.title, obj.short_description, obj.get_absolute_url()
+
+    def fields(self, obj):
+        features = ' '.join(str(feature) for feature in obj.features or [])
+        category = obj.category.name if obj.category_id else ''
+        return (
+            obj.title,
+            obj.short_description,
+            ' '.join([obj.full_description, features, category]),
+        )
+
+
+class ProjectDocument:
+    """Search document for a public Project"""
+    kind = 'project'
+    label = 'Projects'
+    code = 2
+    model = Project
+
+    def get_queryset(self):
+        return Project.objects.filter(is_public=True)
+
+    def is_indexed(self, obj):
+        return obj.is_public
+
+    def result(self, obj):
+        return obj.name, f'{obj.client} - {obj.location}', obj.get_absolute_url()
+
+    def fields(self, obj):
+        return (obj.name, ' '.join([obj.client, obj.location]), obj.description)
+
+
+class NewsDocument:
+    """Search document for a published NewsArticle"""
+    kind = 'news'
+    label = 'News'
+    code = 3
+    model = NewsArticle
+
+    def get_queryset(self):
+        return NewsArticle.objects.filter(is_published=True)
+
+    def is_indexed(self, obj):
+        return obj.is_published
+
+    def result(self, obj):
+        return obj.title, obj.excerpt, obj.get_absolute_url()
+
+    def fields(self, obj):
+        return (obj.title, obj.excerpt, obj.content)
+
+
+class TeamMemberDocument:
+    """Search document for an active TeamMember"""
+    kind = 'team'
+    label = 'Team'
+    code = 4
+    model = TeamMember
+
+    def get_queryset(self):
+        return TeamMember.objects.filter(is_active=True)
+
+    def is_indexed(self, obj):
+        return obj.is_active
+
+    def result(self, obj):
+        return obj.name, obj.position, reverse('main:team')
+
+    def fields(self, obj):
+        specializations = ' '.join(str(spec) for spec in obj.specializations or [])
+        return (obj.name, obj.position, specializations)
+
+
+REGISTRY = {
+    doc.model: doc
+    for doc in (ServiceDocument(), ProjectDocument(), NewsDocument(), TeamMemberDocument())
+}
+KINDS = {doc.kind: doc for doc in REGISTRY.values()}
+_CODES = {doc.code: doc for doc in REGISTRY.values()}
+
+
+def _rowid(doc, pk):
+    return pk * KIND_SLOTS + doc.code
+
+
+# Databases found to have the index table; see is_supported()
+_indexed_databases = set()
+
+
+def is_supported():
+    """
+    Whether this database has the index table. SQLite builds without FTS5
+    never get one, so the migration's outcome is checked rather than the
+    vendor alone. Only a positive answer is cached, so an index created
+    later by migrate is picked up.
+    """
+    if connection.vendor not in ('sqlite', 'postgresql'):
+        return False
+    key = (connection.alias, connection.settings_dict['NAME'])
+    if key not in _indexed_databases:
+        with connection.cursor() as cursor:
+            if TABLE not in connection.introspection.table_names(cursor):
+                return False
+        _indexed_databases.add(key)
+    return True
+
+
+def _write(cursor, rows):
+    """Insert or replace (rowid, kind code, title, summary, body) rows"""
+    if connection.vendor == 'sqlite':
+        cursor.executemany(f"DELETE FROM {TABLE} WHERE rowid = %s", [(row[0],) for row in rows])
+        cursor.executemany(
+            f"INSERT INTO {TABLE} (rowid, title, summary, body) VALUES (%s, %s, %s, %s)",
+            [(row[0], row[2], row[3], row[4]) for row in rows],
+        )
+    else:
+        cursor.executemany(
+            f"INSERT INTO {TABLE} (id, kind, document) VALUES (%s, %s, "
+            f"setweight(to_tsvector('english', %s), 'A') || "
+            f"setweight(to_tsvector('english', %s), 'B') || "
+            f"setweight(to_tsvector('english', %s), 'C')) "
+            f"ON CONFLICT (id) DO UPDATE SET kind = EXCLUDED.kind, document = EXCLUDED.document",
+            rows,
+        )
+
+
+def _delete(cursor, rowids):
+    column = 'rowid' if connection.vendor == 'sqlite' else 'id'
+    cursor.executemany(f"DELETE FROM {TABLE} WHERE {column} = %s", [(rowid,) for rowid in rowids])
+
+
+def index_object(obj):
+    """Add, refresh or drop obj in the index depending on its state"""
+    doc = REGISTRY.get(type(obj))
+    if doc is None or not is_supported():
+        return
+    rowid = _rowid(doc, obj.pk)
+    with connection.cursor() as cursor:
+        if doc.is_indexed(obj):
+            _write(cursor, [(rowid, doc.code, *doc.fields(obj))])
+        else:
+            _delete(cursor, [rowid])
+
+
+def remove_object(model, pk):
+    doc = REGISTRY.get(model)
+    if doc is None or not is_supported():
+        return
+    with connection.cursor() as cursor:
+        _delete(cursor, [_rowid(doc, pk)])
+
+
+def reindex_queryset(queryset, batch_size=500):
+    """Refresh every object in queryset, e.g. after a bulk update()"""
+    doc = REGISTRY.get(queryset.model)
+    if doc is None or not is_supported():
+        return
+    pks = list(queryset.values_list('pk', flat=True))
+    live = doc.get_queryset().filter(pk__in=pks)
+    live_pks = set()
+    with connection.cursor() as cursor:
+        rows = []
+        for obj in live.iterator(chunk_size=batch_size):
+            live_pks.add(obj.pk)
+            rows.append((_rowid(doc, obj.pk), doc.code, *doc.fields(obj)))
+            if len(rows) >= batch_size:
+                _write(cursor, rows)
+                rows = []
+        if rows:
+            _write(cursor, rows)
+        _delete(cursor, [_rowid(doc, pk) for pk in pks if pk not in live_pks])
+
+
+def rebuild(batch_size=500):
+    """Drop every row and re-index all registered models; return the row count"""
+    total = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+        for doc in REGISTRY.values():
+            rows = []
+            for obj in doc.get_queryset().iterator(chunk_size=batch_size):
+                rows.append((_rowid(doc, obj.pk), doc.code, *doc.fields(obj)))
+                if len(rows) >= batch_size:
+                    _write(cursor, rows)
+                    total += len(rows)
+                    rows = []
+            if rows:
+                _write(cursor, rows)
+                total += len(rows)
+    return total
+
+
+def _terms(query):
+    return _WORD_RE.findall(query.lower())
+
+
+def search(query, kinds=None, limit=MAX_RESULTS):
+    """
+    Return up to limit ``(kind, pk)`` pairs matching every term of query,
+    best match first. Terms are prefix-matched.
+    """
+    terms = _terms(query)
+    if not terms or not is_supported():
+        return []
+    codes = [KINDS[kind].code for kind in (kinds or KINDS)]
+    code_list = ', '.join(str(code) for code in codes)
+
+    if connection.vendor == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        sql = (
+            f"SELECT rowid FROM {TABLE} WHERE {TABLE} MATCH %s "
+            f"AND rowid %% {KIND_SLOTS} IN ({code_list}) "
+            f"ORDER BY bm25({TABLE}, {', '.join(str(w) for w in WEIGHTS)}) LIMIT %s"
+        )
+        params = [match, limit]
+    else:
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        sql = (
+            f"SELECT id FROM {TABLE} WHERE document @@ to_tsquery('english', %s) "
+            f"AND kind IN ({code_list}) "
+            f"ORDER BY ts_rank(document, to_tsquery('english', %s)) DESC, id LIMIT %s"
+        )
+        params = [tsquery, tsquery, limit]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rowids = [row[0] for row in cursor.fetchall()]
+    return [(_CODES[rowid % KIND_SLOTS].kind, rowid // KIND_SLOTS) for rowid in rowids]
+
+
+def load_results(hits):
+    """
+    Turn ``(kind, pk)`` hits into result dicts, in order, with one query per
+    kind present. Hits whose object has since disappeared are skipped.
+    """
+    pks_by_kind = {}
+    for kind, pk in hits:
+        pks_by_kind.setdefault(kind, []).append(pk)
+    objects = {
+        kind: KINDS[kind].get_queryset().in_bulk(pks)
+        for kind, pks in pks_by_kind.items()
+    }
+    results = []
+    for kind, pk in hits:
+        obj = objects[kind].get(pk)
+        if obj is None:
+            continue
+        doc = KINDS[kind]
+        title, summary, url = doc.result(obj)
+        results.append({
+            'kind': kind,
+            'label': doc.label,
+            'object': obj,
+            'title': title,
+            'summary': summary,
+            'url': url,
+        })
+    return results
+
+
+def order_by_ids(queryset, pks):
+    """Filter queryset to pks, preserving their order"""
+    if not pks:
+        return queryset.none()
+    ranking = Case(*[When(pk=pk, then=pos) for pos, pk in enumerate(pks)], output_field=IntegerField())
+    return queryset.filter(pk__in=pks).order_by(ranking)
+
+
+def search_services(query, limit=MAX_RESULTS):
+    """Active services matching query, ranked by relevance"""
+    services = Service.objects.filter(is_active=True).select_related('category')
+    if not is_supported():
+        return services.filter(
+            Q(title__icontains=query) |
+            Q(short_description__icontains=query) |
+            Q(category__name__icontains=query)
+        )
+    pks = [pk for kind, pk in search(query, kinds=['service'], limit=limit)]
+    return order_by_ids(services, pks)
@@ -0,0 +1,66 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import (
+    CompanyProfile, CompanyStats, SEOSettings, ServiceCategory, Service, Project,
+    Testimonial, NewsArticle, Partner, TeamMember
+)
+from . import renditions, search
+from .invalidation import invalidate_model
+from .site_settings import invalidate_site_settings
+
+# Models with a generation counter (see main/generations.py)
+GENERATION_MODELS = (ServiceCategory, Service, Project, Testimonial, NewsArticle, Partner, TeamMember)
+
+
+@receiver([post_save, post_delete], sender=CompanyProfile)
+@receiver([post_save, post_delete], sender=CompanyStats)
+@receiver([post_save, post_delete], sender=SEOSettings)
+def site_settings_changed(sender, **kwargs):
+    """Drop the site-settings snapshot in every worker process"""
+    invalidate_site_settings()
+    invalidate_model(sender)
+
+
+def generation_changed(sender, instance, **kwargs):
+    """Invalidate cached fragments and pages built from sender"""
+    invalidate_model(sender, instance.pk)
+
+
+for model in GENERATION_MODELS:
+    post_save.connect(generation_changed, sender=model, dispatch_uid=f'generation_save_{model.__name__}')
+    post_delete.connect(generation_changed, sender=model, dispatch_uid=f'generation_delete_{model.__name__}')
+
+
+def search_document_saved(sender, instance, raw=False, **kwargs):
+    """Keep the full-text index in step with the saved object"""
+    if not raw:
+        search.index_object(instance)
+
+
+def search_document_deleted(sender, instance, **kwargs):
+    search.remove_object(sender, instance.pk)
+
+
+for model in search.REGISTRY:
+    post_save.connect(search_document_saved, sender=model, dispatch_uid=f'search_save_{model.__name__}')
+    post_delete.connect(search_document_deleted, sender=model, dispatch_uid=f'search_delete_{model.__name__}')
+
+
+@receiver(post_save, sender=ServiceCategory)
+def service_category_saved(sender, instance, raw=False, **kwargs):
+    """Category names are part of each service's search document"""
+    if not raw:
+        search.reindex_queryset(instance.services.all())
+
+
+def image_saved(sender, instance, raw=False, **kwargs):
+    """Queue processing of uploaded images; process_jobs does the work"""
+    if raw:
+        return
+    for field_name in renditions.IMAGE_FIELDS[sender]:
+        renditions.enqueue_renditions(instance, field_name)
+
+
+for model in renditions.IMAGE_FIELDS:
+    post_save.connect(image_saved, sender=model, dispatch_uid=f'renditions_{model.__name__}')
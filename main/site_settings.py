@@ -0,0 +1,99 @@
+"""
+Process-wide snapshot of the site-wide settings rows.
+
+CompanyProfile, CompanyStats and every SEOSettings row are loaded once into an
+immutable SiteSettings object that every view and the context processor share.
+A version stamp kept in the shared cache tells each worker process when its
+snapshot is stale; the post_save/post_delete receivers in main.signals bump it
+once the edit commits.
+"""
+import threading
+import uuid
+from types import MappingProxyType
+
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+
+VERSION_KEY = 'site_settings:version'
+
+_lock = threading.Lock()
+_snapshot = None
+
+
+class SiteSettings:
+    """Read-only snapshot of company profile, stats and per-page SEO settings"""
+
+    __slots__ = ('company', 'stats', 'seo', 'version')
+
+    def __init__(self, company, stats, seo, version):
+        object.__setattr__(self, 'company', company)
+        object.__setattr__(self, 'stats', stats)
+        object.__setattr__(self, 'seo', MappingProxyType(dict(seo)))
+        object.__setattr__(self, 'version', version)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SiteSettings snapshots are read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("SiteSettings snapshots are read-only")
+
+    def seo_for(self, page_name):
+        """Return the SEOSettings row for a page, or None"""
+        return self.seo.get(page_name)
+
+
+def _current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # First process up (or the key was culled): publish a fresh stamp so
+        # every worker agrees on it and reloads exactly once.
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _load(version):
+    from .models import CompanyProfile, CompanyStats, SEOSettings
+
+    try:
+        company = CompanyProfile.objects.first()
+        stats = CompanyStats.objects.first()
+        seo = {row.page_name: row for row in SEOSettings.objects.all()}
+    except DatabaseError:
+        # Tables not migrated yet; serve an empty snapshot but don't keep it.
+        return SiteSettings(None, None, {}, None)
+    return SiteSettings(company, stats, seo, version)
+
+
+def get_site_settings():
+    """Return the current snapshot, reloading it only after an invalidation"""
+    global _snapshot
+
+    version = _current_version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    with _lock:
+        snapshot = _snapshot
+        if snapshot is None or snapshot.version != version:
+            # Tag with the version read *before* loading so a concurrent
+            # invalidation forces another reload on the next request.
+            snapshot = _load(version)
+            if snapshot.version is not None:
+                _snapshot = snapshot
+    return snapshot
+
+
+def _publish_version():
+    global _snapshot
+
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+    _snapshot = None
+
+
+def invalidate_site_settings():
+    """Make every process reload its snapshot once the current transaction commits"""
+    # A stamp published before commit lets another worker load the old rows
+    # and keep them under the new version until the next edit.
+    transaction.on_commit(_publish_version)
@@ -0,0 +1,80 @@
+"""
+Serve collected static files with their precompressed siblings.
+
+AssetStorage writes ``name.br`` / ``name.gz`` next to each hashed asset; the
+smallest one the client accepts is sent with Content-Encoding set. Hashed
+names never change content, so they are cached for a year as immutable.
+A front-end server can do the same with e.g. nginx's ``gzip_static`` and
+``brotli_static``, in which case this view is never reached.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+# (Content-Encoding, file suffix), best first
+ENCODINGS = (('br', 'br'), ('gzip', 'gz'))
+
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.[^/.]+$')
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+MUTABLE_MAX_AGE = 5 * 60
+
+
+def accepted_encodings(request):
+    """Content codings the client accepts (q=0 excluded)"""
+    accepted = set()
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = part.partition(';')
+        params = params.replace(' ', '')
+        try:
+            if params.startswith('q=') and float(params[2:]) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def serve(request, path):
+    """Static file view for STATIC_URL when no front-end server handles it"""
+    path = posixpath.normpath(path).lstrip('/')
+    if not settings.STATIC_ROOT or path.endswith(tuple(f'.{suffix}' for _, suffix in ENCODINGS)):
+        raise Http404
+    try:
+        fullpath = safe_join(settings.STATIC_ROOT, path)
+    except ValueError:
+        raise Http404
+    if not os.path.isfile(fullpath):
+        raise Http404
+
+    accepted = accepted_encodings(request)
+    encoding = None
+    for coding, suffix in ENCODINGS:
+        if coding in accepted and os.path.isfile(f'{fullpath}.{suffix}'):
+            encoding, fullpath = coding, f'{fullpath}.{suffix}'
+            break
+
+    stat = os.stat(fullpath)
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        response = HttpResponseNotModified()
+    else:
+        content_type, _ = mimetypes.guess_type(path)
+        response = FileResponse(open(fullpath, 'rb'), content_type=content_type or 'application/octet-stream')
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        if encoding:
+            response['Content-Encoding'] = encoding
+
+    patch_vary_headers(response, ['Accept-Encoding'])
+    if HASHED_NAME_RE.search(path):
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=MUTABLE_MAX_AGE)
+    return response
@@ -0,0 +1,166 @@
+"""
+Dashboard statistics engine.
+
+Each table's numbers come from a single conditional-aggregation query
+(``Count(filter=Q(...))``); the inquiry and project breakdowns are folded into
+the same GROUP BY that produces their totals, and the weekly and monthly
+windows are read from the daily rollups (main/rollups.py). The computed
+result is cached
+for DASHBOARD_STATS_TTL seconds and refreshed single-flight: one caller
+recomputes while everyone else is served the previous value.
+"""
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import (
+    Service, TeamMember, Partner, NewsArticle, Project, ContactInquiry,
+    Newsletter, Testimonial
+)
+from .rollups import daily_trends
+
+STATS_KEY = 'dashboard:stats'
+LOCK_KEY = 'dashboard:stats:lock'
+
+TTL = getattr(settings, 'DASHBOARD_STATS_TTL', 60)
+
+# How long a computing process may hold the refresh lock, and how long a
+# caller with nothing to serve waits for someone else's computation.
+LOCK_TIMEOUT = 30
+WAIT_TIMEOUT = 5
+
+_local_lock = threading.Lock()
+
+
+def _count_by(queryset, field, **counts):
+    """
+    GROUP BY field with conditional counts; return (rows, totals) where rows
+    are ordered by descending count and totals sum every count over all rows.
+    """
+    rows = list(
+        queryset.values(field).annotate(count=Count('id'), **counts).order_by('-count')
+    )
+    totals = {name: sum(row[name] for row in rows) for name in ['count', *counts]}
+    return rows, totals
+
+
+def compute_dashboard_stats():
+    """Compute every dashboard number; one query per table"""
+    today = timezone.localdate()
+    week_ago = today - timedelta(days=7)
+    month_ago = today - timedelta(days=30)
+
+    trends = daily_trends(month_ago, today)
+    this_week = Counter()
+    this_month = Counter()
+    for row in trends:
+        counts = {key: value for key, value in row.items() if key != 'date'}
+        this_month.update(counts)
+        if row['date'] >= week_ago:
+            this_week.update(counts)
+
+    services = Service.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+        featured=Count('id', filter=Q(is_featured=True)),
+    )
+    team = TeamMember.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+        featured=Count('id', filter=Q(is_featured=True)),
+    )
+    newsletter = {
+        'total_subscribers': Newsletter.objects.filter(is_active=True).count(),
+        'new_this_week': this_week['subscriptions'],
+        'new_this_month': this_month['subscriptions'],
+    }
+
+    project_status, projects = _count_by(
+        Project.objects.all(), 'status',
+        public=Count('id', filter=Q(is_public=True)),
+    )
+    status_counts = {row['status']: row['count'] for row in project_status}
+
+    inquiry_types, inquiries = _count_by(
+        ContactInquiry.objects.all(), 'inquiry_type',
+        unresponded=Count('id', filter=Q(is_responded=False)),
+        high_priority=Count('id', filter=Q(priority='high', is_responded=False)),
+    )
+
+    stats = {
+        'services': services,
+        'projects': {
+            'total': projects['count'],
+            'public': projects['public'],
+            'completed': status_counts.get('completed', 0),
+            'in_progress': status_counts.get('construction', 0),
+        },
+        'team': team,
+        'content': {
+            'news_articles': NewsArticle.objects.filter(is_published=True).count(),
+            'testimonials': Testimonial.objects.filter(is_approved=True).count(),
+            'partners': Partner.objects.filter(is_active=True).count(),
+        },
+        'inquiries': {
+            'total': inquiries['count'],
+            'this_week': this_week['inquiries'],
+            'this_month': this_month['inquiries'],
+            'unresponded': inquiries['unresponded'],
+            'high_priority': inquiries['high_priority'],
+        },
+        'newsletter': newsletter,
+    }
+
+    return {
+        'stats': stats,
+        'recent_inquiries': list(ContactInquiry.objects.order_by('-created_at')[:5]),
+        'recent_subscribers': list(Newsletter.objects.order_by('-subscribed_date')[:5]),
+        'recent_articles': list(NewsArticle.objects.filter(is_published=True).order_by('-published_date')[:5]),
+        'inquiry_types': [{'inquiry_type': row['inquiry_type'], 'count': row['count']} for row in inquiry_types],
+        'project_status': [{'status': row['status'], 'count': row['count']} for row in project_status],
+        'trends': trends,
+    }
+
+
+def _refresh():
+    result = compute_dashboard_stats()
+    # Keep the value around past its TTL so it can be served while stale.
+    cache.set(STATS_KEY, (time.time() + TTL, result), TTL * 10)
+    return result
+
+
+def get_dashboard_stats():
+    """Return cached dashboard stats, recomputing at most once per TTL"""
+    cached = cache.get(STATS_KEY)
+    if cached is not None and cached[0] > time.time():
+        return cached[1]
+
+    # Single flight: threads of this process queue on the local lock, and
+    # processes race for the cache lock; losers serve the stale value.
+    with _local_lock:
+        cached = cache.get(STATS_KEY)
+        if cached is not None and cached[0] > time.time():
+            return cached[1]
+        if cache.add(LOCK_KEY, True, LOCK_TIMEOUT):
+            try:
+                return _refresh()
+            finally:
+                cache.delete(LOCK_KEY)
+
+    if cached is not None:
+        return cached[1]
+
+    # Nothing to serve yet: wait briefly for the other process's result.
+    deadline = time.time() + WAIT_TIMEOUT
+    while time.time() < deadline:
+        time.sleep(0.05)
+        cached = cache.get(STATS_KEY)
+        if cached is not None:
+            return cached[1]
+    return _refresh()
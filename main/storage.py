@@ -0,0 +1,68 @@
+"""
+Static files storage that builds asset bundles, fingerprints every file and
+pre-compresses the results (see main/assets.py).
+"""
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+from .assets import BUNDLES, build_bundle, bundle_path
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.map', '.svg', '.json', '.txt', '.ttf', '.html', '.xml')
+
+# Compressed siblings smaller than this fraction of the original are kept.
+MIN_COMPRESSION_RATIO = 0.95
+
+
+class AssetStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage that, during collectstatic, writes every bundle
+    in main.assets.BUNDLES before hashing, and a ``.gz`` (and ``.br`` when the
+    brotli package is installed) sibling of each hashed text asset afterwards.
+    """
+    # Without a manifest (tests, before the first collectstatic) fall back to
+    # the unhashed name instead of raising.
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            for name in BUNDLES:
+                path = bundle_path(name)
+                if self.exists(path):
+                    self.delete(path)
+                self.save(path, ContentFile(build_bundle(name).encode('utf-8')))
+                paths[path] = (self, path)
+
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+        if not dry_run:
+            for hashed_name in set(self.hashed_files.values()):
+                if hashed_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                    self.compress(hashed_name)
+
+    def compress(self, name):
+        """Write the compressed siblings of name that are worth serving"""
+        with self.open(name) as handle:
+            content = handle.read()
+        encoders = [('gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            encoders.append(('br', lambda data: brotli.compress(data, quality=11)))
+        for extension, encode in encoders:
+            compressed = encode(content)
+            target = f'{name}.{extension}'
+            if self.exists(target):
+                self.delete(target)
+            if len(compressed) < len(content) * MIN_COMPRESSION_RATIO:
+                self.save(target, ContentFile(compressed))
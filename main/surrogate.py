@@ -0,0 +1,145 @@
+"""
+Surrogate keys for a caching reverse proxy (Fastly, Varnish, ...).
+
+conditional_page views send::
+
+    Cache-Control: public, no-cache
+    Surrogate-Control: max-age=<SURROGATE_MAX_AGE>
+    Surrogate-Key: site project project-12 service-3 ...
+
+so the proxy keeps pages for a long time while browsers revalidate. Keys are
+``<model>`` for pages listing a model, ``<model>-<pk>`` for each object a
+page shows, and ``site`` for the company profile/stats/SEO rows on every page.
+
+main.invalidation purges ``<model>`` and ``<model>-<pk>`` when an object is saved
+or deleted (``site`` for the site-wide rows). Keys are queued once the
+transaction commits and POSTed to SURROGATE_PURGE_URL in batches, at most
+SURROGATE_PURGE_DELAY seconds after the first key of a batch was queued::
+
+    POST <SURROGATE_PURGE_URL>
+    Surrogate-Key: project project-12
+    {"surrogate_keys": ["project", "project-12"]}
+
+plus any SURROGATE_PURGE_HEADERS (e.g. an API token). Without a purge URL
+nothing is sent. ``manage.py purge_receiver`` is a local stand-in endpoint.
+"""
+import atexit
+import json
+import logging
+import threading
+import time
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.cache import patch_cache_control
+
+logger = logging.getLogger(__name__)
+
+MAX_AGE = getattr(settings, 'SURROGATE_MAX_AGE', 60 * 60 * 24)
+PURGE_URL = getattr(settings, 'SURROGATE_PURGE_URL', None)
+PURGE_HEADERS = getattr(settings, 'SURROGATE_PURGE_HEADERS', {})
+PURGE_DELAY = getattr(settings, 'SURROGATE_PURGE_DELAY', 1.0)
+PURGE_TIMEOUT = 10
+RETRY_DELAY = 5
+
+# Keys per purge request (Fastly accepts up to 256)
+BATCH_SIZE = 256
+
+SITE_KEY = 'site'
+
+
+def model_key(model):
+    return model._meta.model_name
+
+
+def object_key(obj):
+    return f'{obj._meta.model_name}-{obj.pk}'
+
+
+def add_keys(request, *objects):
+    """Tag the page being rendered with the object key of each of objects"""
+    keys = request.__dict__.setdefault('surrogate_keys', set())
+    keys.update(object_key(obj) for obj in objects if obj is not None)
+
+
+def patch_surrogate_headers(response, keys):
+    patch_cache_control(response, public=True, no_cache=True)
+    response['Surrogate-Control'] = f'max-age={MAX_AGE}'
+    response['Surrogate-Key'] = ' '.join(sorted(set(keys)))
+
+
+class Purger:
+    """Collects keys and sends them in debounced batches from a daemon thread"""
+
+    def __init__(self, url=PURGE_URL, delay=PURGE_DELAY):
+        self.url = url
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def add(self, keys):
+        if not self.url:
+            return
+        with self._lock:
+            self._pending.update(keys)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='surrogate-purger', daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def flush(self):
+        """Send every queued key now; return how many were sent"""
+        with self._lock:
+            keys = sorted(self._pending)
+            self._pending.clear()
+        sent = 0
+        for start in range(0, len(keys), BATCH_SIZE):
+            batch = keys[start:start + BATCH_SIZE]
+            try:
+                self.send(batch)
+            except OSError as e:
+                logger.warning('Surrogate key purge failed, retrying later: %s', e)
+                with self._lock:
+                    self._pending.update(keys[start:])
+                break
+            sent += len(batch)
+        return sent
+
+    def send(self, keys):
+        request = Request(
+            self.url,
+            data=json.dumps({'surrogate_keys': keys}).encode(),
+            method='POST',
+            headers={
+                'Content-Type': 'application/json',
+                'Surrogate-Key': ' '.join(keys),
+                **PURGE_HEADERS,
+            },
+        )
+        with urlopen(request, timeout=PURGE_TIMEOUT) as response:
+            response.read()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            # Debounce: let the rest of a burst of edits join this batch.
+            time.sleep(self.delay)
+            self._wakeup.clear()
+            self.flush()
+            if self._pending:
+                # The endpoint is failing; back off before trying again.
+                time.sleep(max(self.delay, RETRY_DELAY))
+                self._wakeup.set()
+
+
+purger = Purger()
+atexit.register(purger.flush)
+
+
+def purge(*keys):
+    """Purge keys from the proxy once the current transaction commits"""
+    if purger.url:
+        transaction.on_commit(lambda: purger.add(keys))
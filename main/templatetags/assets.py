@@ -0,0 +1,27 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+
+from main.assets import BUNDLES, bundle_path
+
+register = template.Library()
+
+
+@register.simple_tag
+def bundle(name):
+    """
+    Include a bundle from main.assets.BUNDLES: the single built file, or each
+    source file while ASSETS_BUNDLE is off (it defaults to ``not DEBUG``).
+
+    {% bundle 'site.css' %}
+    """
+    if getattr(settings, 'ASSETS_BUNDLE', not settings.DEBUG):
+        paths = [bundle_path(name)]
+    else:
+        paths = BUNDLES[name]
+    if name.endswith('.css'):
+        html = '<link rel="stylesheet" href="{}">'
+    else:
+        html = '<script src="{}"></script>'
+    return format_html_join('\n', html, ((static(path),) for path in paths))
@@ -0,0 +1,35 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from main.renditions import srcsets
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(image, sizes='100vw', **attrs):
+    """
+    Render image as a <picture> with WebP and JPEG srcsets, falling back to a
+    plain <img> of the original until its renditions exist. Extra keyword
+    arguments (alt, class, style, ...) become <img> attributes.
+
+    {% responsive_image project.featured_image sizes="(max-width: 768px) 100vw, 33vw" alt=project.name class="card-img-top" %}
+    """
+    if not image:
+        return ''
+    attrs.setdefault('alt', '')
+    attrs.setdefault('loading', 'lazy')
+    attrs.setdefault('decoding', 'async')
+    img_attrs = format_html_join(' ', '{}="{}"', sorted(attrs.items()))
+
+    sets = srcsets(image)
+    if not sets:
+        return format_html('<img src="{}" {}>', image.url, img_attrs)
+
+    return format_html(
+        '<picture style="display: contents">'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" {}>'
+        '</picture>',
+        sets['webp'], sizes, image.url, sets['jpg'], sizes, img_attrs,
+    )
@@ -1,3 +1,108 @@
-from django.test import TestCase
+from concurrent.futures import ThreadPoolExecutor
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections
+from django.test import Client, RequestFactory, TestCase, TransactionTestCase
+from django.utils import timezone
+
+from .dashboard_views import dashboard_stats
+from .models import ContactInquiry, Newsletter, Project, Service
+from .rollups import update_rollups
+from .site_settings import get_site_settings
+from .stats import get_dashboard_stats
+
+
+class DashboardStatsTests(TestCase):
+    """Query budget and correctness of the admin dashboard statistics"""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.staff = User.objects.create_user('staff', password='x', is_staff=True)
+        Service.objects.create(title='A', slug='a', is_featured=True)
+        Service.objects.create(title='B', slug='b', is_active=False)
+        Project.objects.create(name='P1', slug='p1', status='completed')
+        Project.objects.create(name='P2', slug='p2', status='construction', is_public=False)
+        ContactInquiry.objects.create(name='N', inquiry_type='quote', priority='high')
+        ContactInquiry.objects.create(name='M', inquiry_type='quote', is_responded=True)
+        update_rollups()
+        get_site_settings()
+
+    def get(self):
+        request = self.factory.get('/admin/dashboard-stats/')
+        request.user = self.staff
+        return dashboard_stats(request)
+
+    def test_cold_query_count(self):
+        # One query per table, the three "recent" lists, and the trends:
+        # watermarks, stored rollups for each table and today's live tail
+        with self.assertNumQueries(19):
+            response = self.get()
+        self.assertEqual(response.status_code, 200)
+
+    def test_warm_view_issues_no_queries(self):
+        self.get()
+        with self.assertNumQueries(0):
+            self.get()
+
+    def test_numbers(self):
+        stats = get_dashboard_stats()['stats']
+        self.assertEqual(stats['services'], {'total': 2, 'active': 1, 'featured': 1})
+        self.assertEqual(stats['projects'], {'total': 2, 'public': 1, 'completed': 1, 'in_progress': 1})
+        self.assertEqual(stats['inquiries']['total'], 2)
+        self.assertEqual(stats['inquiries']['unresponded'], 1)
+        self.assertEqual(stats['inquiries']['high_priority'], 1)
+        self.assertEqual(stats['inquiries']['this_week'], 2)
+
+
+class ProjectListingTests(TestCase):
+    """The projects page renders a full page of cards in constant queries"""
+
+    def setUp(self):
+        cache.clear()
+        # Cache invalidation runs on commit, as it would after an admin edit
+        with self.captureOnCommitCallbacks(execute=True):
+            services = [Service.objects.create(title=f'S{i}', slug=f's{i}', order=i) for i in range(5)]
+            for i in range(12):
+                project = Project.objects.create(name=f'P{i}', slug=f'p{i}')
+                project.services_provided.set(services[:i % 6])
+        get_site_settings()
+
+    def test_query_count(self):
+        # cached_count's count on a cold cache, the page of projects, and one services prefetch
+        with self.assertNumQueries(3):
+            response = self.client.get('/projects/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['projects']), 9)
+
+    def test_cards_limit_services(self):
+        project = Project.objects.cards().get(slug='p5')
+        self.assertEqual(project.services_count, 5)
+        self.assertEqual([s.title for s in project.card_services], ['S0', 'S1', 'S2'])
+
+
+class NewsletterSubscribeTests(TransactionTestCase):
+    """Concurrent subscribes are single upserts that never collide"""
+
+    def subscribe(self, email):
+        try:
+            return Client().post('/newsletter/subscribe/', {'email': email}).json()
+        finally:
+            connections.close_all()
+
+    def test_concurrent_subscribes(self):
+        Newsletter.objects.create(email='lapsed@example.com', is_active=False, unsubscribed_date=timezone.now())
+        emails = ['new@example.com', 'NEW@example.com', ' New@Example.com ', 'lapsed@example.com', 'LAPSED@example.com']
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(self.subscribe, emails * 20))
+
+        messages = [result['message'] for result in results]
+        self.assertEqual(messages.count('Successfully subscribed to newsletter!'), 1)
+        self.assertEqual(messages.count('Subscription reactivated!'), 1)
+        self.assertEqual(messages.count('Email already subscribed.'), len(results) - 2)
+        self.assertQuerySetEqual(
+            Newsletter.objects.order_by('email').values_list('email', 'is_active', 'unsubscribed_date'),
+            [('lapsed@example.com', True, None), ('new@example.com', True, None)],
+            transform=tuple,
+        )
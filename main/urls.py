@@ -23,6 +23,9 @@ urlpatterns = [
     path('news/', views.news, name='news'),
     path('news/<slug:slug>/', views.news_detail, name='news_detail'),
     
+    # Search
+    path('search/', views.site_search, name='search'),
+    
     # About
     path('about/', views.about, name='about'),
     
@@ -31,6 +34,7 @@ urlpatterns = [
     
     # AJAX endpoints
     path('newsletter/subscribe/', views.newsletter_subscribe, name='newsletter_subscribe'),
+    path('csrf/', views.csrf_token, name='csrf_token'),
     
     # Admin dashboard
     path('admin/dashboard-stats/', dashboard_views.dashboard_stats, name='dashboard_stats'),
@@ -0,0 +1,144 @@
+"""
+Write-behind buffer for NewsArticle view counts.
+
+news_detail() records a view in an in-process counter instead of writing the
+row. A background thread flushes the buffer every VIEW_COUNTER_FLUSH_INTERVAL
+seconds with one atomic ``F('views_count') + n`` UPDATE per distinct
+increment, and the thread is woken early as soon as VIEW_COUNTER_MAX_PENDING
+views are buffered, so a request never waits on (or fails with) the write.
+A failed flush keeps its views for the next one, but the buffer never holds
+more than VIEW_COUNTER_MAX_BUFFERED views (default 10 * MAX_PENDING): while
+the database keeps failing, views past that are dropped with a warning. A
+crashed process therefore loses at most MAX_BUFFERED views, and a clean
+shutdown flushes via atexit.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = getattr(settings, 'VIEW_COUNTER_FLUSH_INTERVAL', 10)
+MAX_PENDING = getattr(settings, 'VIEW_COUNTER_MAX_PENDING', 500)
+MAX_BUFFERED = getattr(settings, 'VIEW_COUNTER_MAX_BUFFERED', MAX_PENDING * 10)
+
+_lock = threading.Lock()
+_pending = Counter()
+_flusher = None
+# Views dropped since the last successful flush
+_dropped = 0
+# Set to flush before the interval is up
+_wake = threading.Event()
+
+
+def record_view(pk):
+    """Buffer one view of the article with primary key pk"""
+    global _dropped
+
+    with _lock:
+        buffered = sum(_pending.values())
+        if buffered >= MAX_BUFFERED:
+            _dropped += 1
+            first_drop = _dropped == 1
+        else:
+            _pending[pk] += 1
+            first_drop = False
+        full = buffered + 1 >= MAX_PENDING
+    if first_drop:
+        logger.warning('View buffer full at %d views; dropping new views until a flush succeeds', MAX_BUFFERED)
+    _ensure_flusher()
+    if not full:
+        return
+    if _flusher is not None:
+        _wake.set()
+        return
+    # No background thread (FLUSH_INTERVAL = 0): flush here, but a locked
+    # database must not fail the page view.
+    try:
+        flush_views()
+    except DatabaseError as e:
+        logger.warning('Could not flush %d buffered views: %s', pending_views(), e)
+
+
+def pending_views(pk=None):
+    """Return buffered views for one article, or for all of them"""
+    with _lock:
+        if pk is None:
+            return sum(_pending.values())
+        return _pending.get(pk, 0)
+
+
+def flush_views():
+    """Write buffered views to the database; return how many were written"""
+    global _dropped
+
+    from .models import NewsArticle
+
+    with _lock:
+        batch = dict(_pending)
+        _pending.clear()
+    if not batch:
+        return 0
+
+    # One UPDATE per distinct increment: most articles in a batch share n=1.
+    by_increment = defaultdict(list)
+    for pk, count in batch.items():
+        by_increment[count].append(pk)
+
+    remaining = list(by_increment.items())
+    written = 0
+    try:
+        while remaining:
+            count, pks = remaining[0]
+            NewsArticle.objects.filter(pk__in=pks).update(views_count=F('views_count') + count)
+            written += count * len(pks)
+            remaining.pop(0)
+    except DatabaseError:
+        # Put back whatever was not written so the next flush retries it,
+        # as far as views recorded meanwhile leave room.
+        with _lock:
+            room = MAX_BUFFERED - sum(_pending.values())
+            for count, pks in remaining:
+                for pk in pks:
+                    kept = max(0, min(count, room))
+                    if kept:
+                        _pending[pk] += kept
+                    room -= kept
+                    _dropped += count - kept
+        raise
+    with _lock:
+        dropped, _dropped = _dropped, 0
+    if dropped:
+        logger.warning('Dropped %d views while the view buffer was full', dropped)
+    return written
+
+
+def _run_flusher():
+    while True:
+        _wake.wait(FLUSH_INTERVAL)
+        _wake.clear()
+        try:
+            flush_views()
+        except DatabaseError as e:
+            logger.warning('Could not flush %d buffered views: %s', pending_views(), e)
+        finally:
+            connections.close_all()
+
+
+def _ensure_flusher():
+    global _flusher
+
+    if _flusher is not None or not FLUSH_INTERVAL:
+        return
+    with _lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_run_flusher, name='view-counter-flusher', daemon=True)
+            _flusher.start()
+
+
+atexit.register(flush_views)
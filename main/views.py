@@ -1,51 +1,64 @@
+import logging
+
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
-from django.contrib import messages
+from django.http import HttpResponse, JsonResponse
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
 from django.core.paginator import Paginator
-from django.db.models import Q
 from django.utils import timezone
+from django.middleware.csrf import get_token
+from django.views.decorators.cache import never_cache
 from .models import (
-    CompanyProfile, CompanyStats, ServiceCategory, Service, TeamMember,
-    Partner, NewsArticle, Project, ContactInquiry, Newsletter, Testimonial, SEOSettings
+    ServiceCategory, Service, TeamMember,
+    Partner, NewsArticle, Project, ContactInquiry, Testimonial
 )
+from .site_settings import get_site_settings
+from .freshness import conditional_page
+from .surrogate import add_keys
+from .generations import FRAGMENT_TIMEOUT, cached_count, cached_section, generation_key
+from .pagination import KeysetPaginator
+from . import intake, newsletter
+from .search import KINDS, SITE_MAX_RESULTS, load_results, search, search_services
+from .view_counter import record_view
+
+logger = logging.getLogger(__name__)
+
+# Models whose edits change the rendered homepage
+HOME_MODELS = (Service, Project, Testimonial, NewsArticle, Partner, TeamMember)
 
 def get_company_context():
     """Get common company data for all views"""
-    try:
-        company = CompanyProfile.objects.first()
-        stats = CompanyStats.objects.first()
-    except:
-        company = None
-        stats = None
+    snapshot = get_site_settings()
     
     return {
-        'company': company,
-        'stats': stats,
+        'company': snapshot.company,
+        'stats': snapshot.stats,
     }
 
+@conditional_page(*HOME_MODELS)
 def home(request):
     """Homepage view"""
-    context = get_company_context()
+    snapshot = get_site_settings()
+    page_key = generation_key('page:home:{}'.format(snapshot.version), *HOME_MODELS)
+    html = cache.get(page_key)
+    if html is not None:
+        return HttpResponse(html)
     
-    # Get featured content
-    context.update({
-        'featured_services': Service.objects.filter(is_featured=True, is_active=True)[:6],
-        'featured_projects': Project.objects.filter(is_featured=True, is_public=True)[:3],
-        'featured_testimonials': Testimonial.objects.filter(is_featured=True, is_approved=True)[:3],
-        'recent_news': NewsArticle.objects.filter(is_published=True)[:3],
-        'partners': Partner.objects.filter(is_active=True)[:8],
-        'team_members': TeamMember.objects.filter(is_featured=True, is_active=True)[:4],
-    })
+    context = get_company_context()
     
     # SEO
-    try:
-        seo = SEOSettings.objects.get(page_name='home')
+    seo = snapshot.seo_for('home')
+    if seo is not None:
         context['seo'] = seo
-    except SEOSettings.DoesNotExist:
-        pass
     
-    return render(request, 'home.html', context)
+    response = render(request, 'home.html', context)
+    # A page carrying a per-visitor CSRF token must never be shared
+    if not request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+        cache.set(page_key, response.content, FRAGMENT_TIMEOUT)
+    return response
 
+@conditional_page(ServiceCategory, Service)
 def services(request):
     """Services listing page"""
     context = get_company_context()
@@ -53,14 +66,10 @@ def services(request):
     categories = ServiceCategory.objects.filter(is_active=True).prefetch_related('services')
     services_list = Service.objects.filter(is_active=True)
     
-    # Search functionality
+    # Search functionality, ranked by relevance
     search_query = request.GET.get('search', '')
     if search_query:
-        services_list = services_list.filter(
-            Q(title__icontains=search_query) |
-            Q(short_description__icontains=search_query) |
-            Q(category__name__icontains=search_query)
-        )
+        services_list = search_services(search_query)
     
     context.update({
         'categories': categories,
@@ -70,10 +79,48 @@ def services(request):
     
     return render(request, 'services.html', context)
 
+def site_search(request):
+    """Site-wide search across services, projects, news and team"""
+    context = get_company_context()
+    
+    query = request.GET.get('q', '').strip()
+    selected_type = request.GET.get('type', '')
+    
+    hits = search(query, limit=SITE_MAX_RESULTS) if query else []
+    
+    # Facet counts over the whole ranked set, before the type filter
+    facet_counts = {}
+    for kind, pk in hits:
+        facet_counts[kind] = facet_counts.get(kind, 0) + 1
+    facets = [
+        {'kind': kind, 'label': doc.label, 'count': facet_counts.get(kind, 0)}
+        for kind, doc in KINDS.items()
+    ]
+    
+    if selected_type in KINDS:
+        hits = [hit for hit in hits if hit[0] == selected_type]
+    
+    # Pagination; only the current page's objects are loaded
+    paginator = Paginator(hits, 10)
+    results = paginator.get_page(request.GET.get('page'))
+    results.object_list = load_results(results.object_list)
+    
+    context.update({
+        'query': query,
+        'selected_type': selected_type,
+        'facets': facets,
+        'total_hits': len(hits),
+        'results': results,
+    })
+    
+    return render(request, 'search.html', context)
+
+@conditional_page(ServiceCategory, Service, surrogate_models=(Service,))
 def service_detail(request, slug):
     """Service detail page"""
     context = get_company_context()
     service = get_object_or_404(Service, slug=slug, is_active=True)
+    add_keys(request, service, service.category)
     
     # Related services
     related_services = Service.objects.filter(
@@ -87,6 +134,7 @@ def service_detail(request, slug):
     
     return render(request, 'service_detail.html', context)
 
+@conditional_page(TeamMember)
 def team(request):
     """Team page"""
     context = get_company_context()
@@ -99,6 +147,7 @@ def team(request):
     
     return render(request, 'team.html', context)
 
+@conditional_page(Project, Service)
 def projects(request):
     """Projects/Portfolio page"""
     context = get_company_context()
@@ -115,10 +164,13 @@ def projects(request):
     if status:
         projects_list = projects_list.filter(status=status)
     
-    # Pagination
-    paginator = Paginator(projects_list, 9)
-    page_number = request.GET.get('page')
-    projects = paginator.get_page(page_number)
+    # Keyset pagination: every page costs one query, however deep. The total
+    # is only counted once per content change, and only for real filters.
+    total = None
+    if project_type in ('', *dict(Project.PROJECT_TYPES)) and status in ('', *dict(Project.PROJECT_STATUS)):
+        total = cached_count('projects:{}:{}'.format(project_type, status), projects_list, Project)
+    paginator = KeysetPaginator(projects_list.cards(), ('-start_date', '-id'), 9)
+    projects = paginator.get_page(request.GET.get('cursor'), request.GET, total=total)
     
     context.update({
         'projects': projects,
@@ -130,10 +182,14 @@ def projects(request):
     
     return render(request, 'projects.html', context)
 
+@conditional_page(Project, Service, TeamMember)
 def project_detail(request, slug):
     """Project detail page"""
     context = get_company_context()
-    project = get_object_or_404(Project, slug=slug, is_public=True)
+    project = get_object_or_404(
+        Project.objects.prefetch_related('services_provided', 'team_members'), slug=slug, is_public=True
+    )
+    add_keys(request, project, *project.services_provided.all(), *project.team_members.all())
     
     context.update({
         'project': project,
@@ -141,6 +197,7 @@ def project_detail(request, slug):
     
     return render(request, 'project_detail.html', context)
 
+@conditional_page(NewsArticle)
 def news(request):
     """News/Blog listing page"""
     context = get_company_context()
@@ -152,10 +209,13 @@ def news(request):
     if article_type:
         articles_list = articles_list.filter(article_type=article_type)
     
-    # Pagination
-    paginator = Paginator(articles_list, 6)
-    page_number = request.GET.get('page')
-    articles = paginator.get_page(page_number)
+    # Keyset pagination: every page costs one query, however deep. The total
+    # is only counted once per content change, and only for real filters.
+    total = None
+    if article_type in ('', *dict(NewsArticle.ARTICLE_TYPES)):
+        total = cached_count('news:{}'.format(article_type), articles_list, NewsArticle)
+    paginator = KeysetPaginator(articles_list, ('-published_date', '-id'), 6)
+    articles = paginator.get_page(request.GET.get('cursor'), request.GET, total=total)
     
     context.update({
         'articles': articles,
@@ -166,10 +226,18 @@ def news(request):
     
     return render(request, 'news.html', context)
 
+def count_cached_view(request, slug):
+    """Count a view answered without rendering (a 304 or a page cache hit)"""
+    pk = NewsArticle.objects.filter(slug=slug, is_published=True).values_list('pk', flat=True).first()
+    if pk is not None:
+        record_view(pk)
+
+@conditional_page(NewsArticle, on_not_rendered=count_cached_view)
 def news_detail(request, slug):
     """News article detail page"""
     context = get_company_context()
     article = get_object_or_404(NewsArticle, slug=slug, is_published=True)
+    add_keys(request, article)
     
     # Increment views
     article.increment_views()
@@ -186,6 +254,7 @@ def news_detail(request, slug):
     
     return render(request, 'news_detail.html', context)
 
+@conditional_page(TeamMember, Partner)
 def about(request):
     """About page"""
     context = get_company_context()
@@ -197,66 +266,67 @@ def about(request):
     
     return render(request, 'about.html', context)
 
+@conditional_page(Service)
 def contact(request):
     """Contact page"""
-    context = get_company_context()
-    
     if request.method == 'POST':
-        # Handle contact form submission
+        # Validate and spool the submission; process_inquiries stores it.
+        try:
+            data = intake.clean_submission(request.POST)
+        except ValidationError as e:
+            return JsonResponse({'success': False, 'errors': e.message_dict}, status=400)
         try:
-            inquiry = ContactInquiry(
-                inquiry_type=request.POST.get('inquiry_type', 'general'),
-                name=request.POST.get('name'),
-                email=request.POST.get('email'),
-                phone=request.POST.get('phone', ''),
-                company=request.POST.get('company', ''),
-                subject=request.POST.get('subject'),
-                message=request.POST.get('message'),
-                project_budget=request.POST.get('budget', ''),
-                project_timeline=request.POST.get('timeline', ''),
-            )
-            inquiry.save()
-            
-            # Add selected services
-            services = request.POST.getlist('services')
-            if services:
-                inquiry.services_interested.set(services)
-            
-            messages.success(request, 'Thank you for your inquiry! We will get back to you soon.')
-            return JsonResponse({'success': True})
-        except Exception as e:
-            messages.error(request, 'There was an error submitting your inquiry. Please try again.')
-            return JsonResponse({'success': False, 'error': str(e)})
+            intake.submit(data)
+        except OSError:
+            # Full disk or an unwritable spool; the page script expects JSON.
+            logger.exception('Could not spool a contact submission')
+            return JsonResponse(
+                {'success': False, 'error': 'Your inquiry could not be received. Please try again later.'},
+                status=503)
+        return JsonResponse({'success': True})
+    
+    # The form carries no CSRF token (the page script fetches one when
+    # submitting), so one rendered shell serves every visitor.
+    snapshot = get_site_settings()
+    page_key = generation_key('page:contact:{}'.format(snapshot.version), Service)
+    html = cache.get(page_key)
+    if html is not None:
+        return HttpResponse(html)
     
+    context = get_company_context()
     context.update({
-        'services': Service.objects.filter(is_active=True),
+        'services': cached_section(
+            'contact:services',
+            Service.objects.filter(is_active=True).only('id', 'title', 'order'), Service),
         'inquiry_types': ContactInquiry.INQUIRY_TYPES,
     })
     
-    return render(request, 'contact.html', context)
+    response = render(request, 'contact.html', context)
+    if not request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+        cache.set(page_key, response.content, FRAGMENT_TIMEOUT)
+    return response
 
 def newsletter_subscribe(request):
     """Newsletter subscription endpoint"""
     if request.method == 'POST':
-        email = request.POST.get('email')
-        name = request.POST.get('name', '')
+        email = newsletter.normalize_email(request.POST.get('email'))
+        name = request.POST.get('name', '').strip()[:100]
         
-        if email:
-            newsletter, created = Newsletter.objects.get_or_create(
-                email=email,
-                defaults={'name': name, 'is_active': True}
-            )
-            
-            if created:
-                return JsonResponse({'success': True, 'message': 'Successfully subscribed to newsletter!'})
-            else:
-                if newsletter.is_active:
-                    return JsonResponse({'success': False, 'message': 'Email already subscribed.'})
-                else:
-                    newsletter.is_active = True
-                    newsletter.save()
-                    return JsonResponse({'success': True, 'message': 'Subscription reactivated!'})
+        try:
+            validate_email(email)
+        except ValidationError:
+            return JsonResponse({'success': False, 'message': 'Please provide a valid email address.'})
         
-        return JsonResponse({'success': False, 'message': 'Please provide a valid email address.'})
+        status = newsletter.subscribe(email, name)
+        if status == newsletter.CREATED:
+            return JsonResponse({'success': True, 'message': 'Successfully subscribed to newsletter!'})
+        if status == newsletter.REACTIVATED:
+            return JsonResponse({'success': True, 'message': 'Subscription reactivated!'})
+        return JsonResponse({'success': False, 'message': 'Email already subscribed.'})
     
     return JsonResponse({'success': False, 'message': 'Invalid request method.'})
+
+@never_cache
+def csrf_token(request):
+    """Issue the CSRF cookie and token for forms on shared, cached pages"""
+    return JsonResponse({'token': get_token(request)})
@@ -14,10 +14,14 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
+
+from main import static_views
 
 urlpatterns = [
+    re_path(r'^%s(?P<path>.*)$' % settings.STATIC_URL.lstrip('/'), static_views.serve),
     path('admin/', admin.site.urls),
     path('', include('main.urls')),  
 ]